@@ -0,0 +1,33 @@
+"""Add daily like stats
+
+Revision ID: 3c7a1f9e5b28
+Revises: 9b3e6a4d2c15
+Create Date: 2026-10-19 15:12:43.218507
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c7a1f9e5b28"
+down_revision: Union[str, None] = "9b3e6a4d2c15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_like_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("likes_count", sa.Integer(), nullable=False),
+        sa.Column("users_count", sa.Integer(), nullable=False),
+        sa.Column("users_sketch", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_like_stats")
@@ -0,0 +1,41 @@
+"""Add unique like per user and post
+
+Revision ID: 7e2b9d4c8a61
+Revises: 3c7a1f9e5b28
+Create Date: 2026-10-19 17:41:09.502316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7e2b9d4c8a61"
+down_revision: Union[str, None] = "3c7a1f9e5b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent requests could store the same like twice; keep the first.
+    op.execute(
+        """
+        DELETE FROM likes AS duplicate
+        USING likes AS original
+        WHERE duplicate.user_id = original.user_id
+          AND duplicate.post_id = original.post_id
+          AND duplicate.id > original.id
+        """
+    )
+    op.create_index(
+        "uq_likes_user_id_post_id",
+        "likes",
+        ["user_id", "post_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_likes_user_id_post_id", table_name="likes")
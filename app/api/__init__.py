@@ -3,6 +3,9 @@ from fastapi import APIRouter
 from app.api.user import router as user_router
 from app.api.post import router as post_router
 from app.api.like import router as like_router
+from app.api.export import router as export_router
+from app.api.monitoring import router as monitoring_router
+from app.api.profiling import router as profiling_router
 
 
 api_router = APIRouter()
@@ -14,3 +17,12 @@ api_router.include_router(user_router, prefix="/users", tags=["User"])
 api_router.include_router(
     like_router, prefix="/likes", tags=["Like"]
 )
+api_router.include_router(
+    export_router, prefix="/exports", tags=["Export"]
+)
+api_router.include_router(
+    monitoring_router, prefix="/monitoring", tags=["Monitoring"]
+)
+api_router.include_router(
+    profiling_router, prefix="/profiling", tags=["Profiling"]
+)
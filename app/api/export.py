@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth.security import get_current_admin_profile
+from app.models import User
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.utils.dependencies.services import get_export_service
+
+router = APIRouter()
+
+
+@router.get("/{entity}")
+async def export(
+    entity: str,
+    date_from: str = Query(
+        ..., description="Start date in the format YYYY-MM-DD"
+    ),
+    date_to: str = Query(
+        ..., description="Completion date in the format YYYY-MM-DD"
+    ),
+    format: str = Query("ndjson", description="Either csv or ndjson"),
+    current_user: User = Depends(get_current_admin_profile),
+    service: ExportService = Depends(get_export_service),
+):
+    chunks = service.export(entity, date_from, date_to, format)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity}.{format}"'
+        },
+    )
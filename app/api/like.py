@@ -1,10 +1,23 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from app.auth.security import get_current_active_profile
 from app.models import User
 from app.serializers.like_serializer import LikeAdd, LikeDelete
+from app.services.analytics_service import AnalyticsService
 from app.services.like_service import LikeService
-from app.utils.dependencies.services import get_like_service
+from app.services.like_stream import like_count_broadcaster
+from app.utils.dependencies.services import (
+    get_analytics_service,
+    get_like_service,
+)
+from app.utils.query_params import parse_ids
+from config import LIKE_STREAM_MAX_POSTS
+
+KEEPALIVE_SECONDS = 15
 
 router = APIRouter()
 
@@ -39,3 +52,82 @@ async def get_likes_analytics(
     service: LikeService = Depends(get_like_service),
 ):
     return await service.get_likes_analytics(date_from, date_to)
+
+
+@router.get("/analytics/active_users/")
+async def get_active_users(
+    date_from: str = Query(
+        ..., description="Start date in the format YYYY-MM-DD"
+    ),
+    date_to: str = Query(
+        ..., description="Completion date in the format YYYY-MM-DD"
+    ),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_active_users(date_from, date_to)
+
+
+@router.get("/analytics/retention/")
+async def get_retention_cohorts(
+    date_from: str = Query(
+        ...,
+        description="Start date of the signup weeks in the format YYYY-MM-DD",
+    ),
+    date_to: str = Query(
+        ..., description="Completion date in the format YYYY-MM-DD"
+    ),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_retention_cohorts(date_from, date_to)
+
+
+@router.get("/analytics/unique_users/")
+async def get_unique_users(
+    date_from: str = Query(
+        ..., description="Start date in the format YYYY-MM-DD"
+    ),
+    date_to: str = Query(
+        ..., description="Completion date in the format YYYY-MM-DD"
+    ),
+    exact: bool = Query(
+        False, description="Count exactly even over long ranges"
+    ),
+    service: AnalyticsService = Depends(get_analytics_service),
+):
+    return await service.get_unique_users(date_from, date_to, exact)
+
+
+@router.get("/stream")
+async def stream_like_counts(
+    ids: str = Query(
+        ..., description="Comma-separated post ids, for example 1,2,3"
+    ),
+):
+    post_ids = parse_ids(ids, LIKE_STREAM_MAX_POSTS)
+
+    async def generate():
+        subscriber = like_count_broadcaster.subscribe(post_ids)
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        subscriber.ready.wait(), KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if like_count_broadcaster.closed:
+                    break
+                for post_id, likes_count in subscriber.take().items():
+                    data = json.dumps(
+                        {"post_id": post_id, "likes_count": likes_count}
+                    )
+                    yield f"event: like_count\ndata: {data}\n\n"
+        finally:
+            like_count_broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,79 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.like_archive import like_archive
+from app.repositories.like_repository import group_commit_stats
+from app.services.like_stream import like_count_broadcaster
+from app.services.post_filter import post_id_filter
+from app.services.recommendation_service import recommendation_engine
+from app.utils.admission import admission_controller
+from app.utils.cache import entity_cache
+from app.utils.invalidation import invalidation_bus
+from app.utils.job_queue import job_queue
+from app.utils.lifecycle import lifecycle
+from app.utils.profiler import profiler
+from app.utils.singleflight import singleflight
+
+router = APIRouter()
+
+
+@router.get("/ready/")
+async def get_readiness():
+    return JSONResponse(
+        lifecycle.stats(), status_code=200 if lifecycle.ready else 503
+    )
+
+
+@router.get("/admission/")
+async def get_admission_stats():
+    return admission_controller.stats()
+
+
+@router.get("/jobs/")
+async def get_job_queue_stats():
+    return job_queue.stats()
+
+
+@router.get("/cache/")
+async def get_cache_stats():
+    return entity_cache.stats()
+
+
+@router.get("/post_filter/")
+async def get_post_filter_stats():
+    return post_id_filter.stats()
+
+
+@router.get("/recommendations/")
+async def get_recommendation_stats():
+    return recommendation_engine.stats()
+
+
+@router.get("/like_stream/")
+async def get_like_stream_stats():
+    return like_count_broadcaster.stats()
+
+
+@router.get("/like_archive/")
+async def get_like_archive_stats():
+    return like_archive.stats()
+
+
+@router.get("/invalidation/")
+async def get_invalidation_stats():
+    return invalidation_bus.stats()
+
+
+@router.get("/singleflight/")
+async def get_singleflight_stats():
+    return singleflight.stats()
+
+
+@router.get("/like_group_commit/")
+async def get_like_group_commit_stats():
+    return group_commit_stats()
+
+
+@router.get("/profiler/")
+async def get_profiler_stats():
+    return profiler.stats()
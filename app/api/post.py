@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
 from app.auth.security import get_current_active_profile
 from app.models import User
-from app.serializers.post_serializer import PostResponse, PostCreate
-from app.services.post_service import PostService
+from app.serializers.post_serializer import (
+    PostResponse,
+    PostCreate,
+    PostLikeCount,
+    PostSearchPage,
+    SimilarPost,
+)
+from app.services.post_service import PostService, MAX_LIKE_COUNT_IDS
+from app.services.recommendation_service import recommendation_engine
 from app.utils.dependencies.services import get_post_service
+from app.utils.query_params import parse_ids
 
 router = APIRouter()
 
@@ -16,3 +24,38 @@ async def create_post(
     service: PostService = Depends(get_post_service),
 ):
     return await service.create_post(item, current_user.id)
+
+
+@router.get("/like_counts", response_model=list[PostLikeCount])
+async def get_like_counts(
+    ids: str = Query(
+        ..., description="Comma-separated post ids, for example 1,2,3"
+    ),
+    service: PostService = Depends(get_post_service),
+):
+    post_ids = parse_ids(ids, MAX_LIKE_COUNT_IDS)
+    return await service.get_like_counts(post_ids)
+
+
+@router.get("/search", response_model=PostSearchPage)
+async def search_posts(
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str
+    | None = Query(None, description="next_cursor of the previous page"),
+    service: PostService = Depends(get_post_service),
+):
+    return await service.search_posts(q, limit, cursor)
+
+
+@router.get("/{post_id}/similar", response_model=list[SimilarPost])
+async def get_similar_posts(
+    post_id: int,
+    limit: int = Query(10, ge=1, le=100),
+):
+    return [
+        SimilarPost(post_id=similar_id, co_likes=co_likes)
+        for similar_id, co_likes in recommendation_engine.similar(
+            post_id, limit
+        )
+    ]
@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.auth.security import get_current_admin_profile
+from app.models import User
+from app.utils.profiler import format_collapsed, profiler
+from config import PROFILER_MAX_SECONDS
+
+router = APIRouter()
+
+
+def collapsed_file(samples, name: str) -> PlainTextResponse:
+    return PlainTextResponse(
+        format_collapsed(samples),
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.collapsed"'
+        },
+    )
+
+
+@router.get("/cpu/")
+async def profile_cpu(
+    seconds: float = Query(
+        10, gt=0, le=PROFILER_MAX_SECONDS, description="How long to sample"
+    ),
+    interval_ms: float = Query(
+        None, ge=1, le=1000, description="Milliseconds between samples"
+    ),
+    current_user: User = Depends(get_current_admin_profile),
+):
+    interval = interval_ms / 1000 if interval_ms else None
+    samples = await profiler.profile(seconds, interval)
+    if samples is None:
+        raise HTTPException(
+            status_code=409, detail="Another profile is in progress"
+        )
+    return collapsed_file(
+        samples, f"cpu-{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}"
+    )
+
+
+@router.get("/requests/")
+async def list_request_profiles(
+    current_user: User = Depends(get_current_admin_profile),
+):
+    return profiler.list_request_profiles()
+
+
+@router.get("/requests/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_admin_profile),
+):
+    samples = profiler.get_request_profile(profile_id)
+    if samples is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return collapsed_file(samples, f"request-{profile_id}")
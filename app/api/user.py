@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.auth.security import get_current_active_profile
-from app.auth.token_serializer import Token
+from app.auth.token_serializer import (
+    Token,
+    RefreshTokenRequest,
+    RefreshTokenRevoked,
+)
 from app.models import User
 from app.serializers.user_serializer import (
     UserCreate,
     UserResponse,
     UserActivityResponse,
 )
-from app.services.user_service import UserService
+from app.services.user_service import UserService, MAX_ACTIVITY_IDS
 from app.utils.dependencies.services import get_user_service
+from app.utils.query_params import parse_ids
 
 router = APIRouter()
 
@@ -28,10 +34,24 @@ async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     service: UserService = Depends(get_user_service),
 ):
-    access_token = await service.login_user(
-        form_data.username, form_data.password
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return await service.login_user(form_data.username, form_data.password)
+
+
+@router.post("/token/refresh/", response_model=Token)
+async def refresh_access_token(
+    item: RefreshTokenRequest,
+    service: UserService = Depends(get_user_service),
+):
+    return await service.refresh_access_token(item.refresh_token)
+
+
+@router.post("/token/revoke/", response_model=RefreshTokenRevoked)
+async def revoke_refresh_token(
+    item: RefreshTokenRequest,
+    service: UserService = Depends(get_user_service),
+):
+    revoked = await service.revoke_refresh_token(item.refresh_token)
+    return RefreshTokenRevoked(revoked=revoked)
 
 
 @router.get("/users/me/", response_model=UserResponse)
@@ -46,7 +66,20 @@ async def get_user_activity(
     user_id: int,
     user_service: UserService = Depends(get_user_service),
 ):
-    return UserActivityResponse(
-        last_login=await user_service.get_last_login(user_id),
-        last_request=await user_service.get_last_request(user_id),
-    )
+    return await user_service.get_activity(user_id)
+
+
+@router.get("/activity")
+async def get_users_activity(
+    ids: str = Query(
+        ..., description="Comma-separated user ids, for example 1,2,3"
+    ),
+    user_service: UserService = Depends(get_user_service),
+):
+    user_ids = parse_ids(ids, MAX_ACTIVITY_IDS)
+
+    async def generate():
+        async for activity in user_service.stream_activities(user_ids):
+            yield activity.model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -1,14 +1,21 @@
+import hashlib
+import secrets
 from typing import Annotated
-from sqlalchemy import select
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from app.auth.token_serializer import TokenData
 from app.models import User
-from app.utils.dependencies.get_session import get_session
+from app.utils.dependencies.repositories import (
+    Repositories,
+    get_repositories,
+)
+from app.utils.dependencies.request_context import (
+    RequestContext,
+    get_request_context,
+)
 from config import (
     pwd_context,
     oauth2_scheme,
@@ -30,36 +37,21 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
-async def get_user(session: AsyncSession, username: str):
-    """
-    Retrieves a user from the database by their username.
-
-    Args:
-        session (AsyncSession): The asynchronous database session.
-        username (str): The username of the user to retrieve.
-
-    Returns:
-        User: The user model instance.
-
-    Raises:
-        HTTPException: If the user with the specified username does not exist.
-    """
-    result = await session.execute(
-        select(User).filter(User.username == username)
-    )
-    return result.scalar_one_or_none()
-
-
 async def get_current_profile(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_session),
+    repos: Repositories = Depends(get_repositories),
+    context: RequestContext = Depends(get_request_context),
 ):
     """
     Retrieves the current user's profile based on the provided JWT token.
 
+    The profile is remembered in the request context, so services handling the
+    same request do not load it again.
+
     Args:
         token (str, optional): The JWT token obtained from the request headers.
-        session (AsyncSession, optional): The asynchronous database session.
+        repos (Repositories, optional): The repositories of the current request.
+        context (RequestContext, optional): The identity map of the current request.
 
     Returns:
         User: The user model instance representing the current user's profile.
@@ -80,9 +72,11 @@ async def get_current_profile(
         token_data = TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    profile = await get_user(session, username=token_data.username)
+    profile = await repos.users.get_profile_by_username(token_data.username)
     if profile is None:
         raise credentials_exception
+    context.current_user = profile
+    context.remember(profile)
     return profile
 
 
@@ -101,45 +95,41 @@ async def get_current_active_profile(
     return current_user
 
 
-async def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def get_current_admin_profile(
+    current_user: Annotated[User, Depends(get_current_active_profile)]
+):
     """
-    Verifies the provided plain password against the stored hashed password.
+    Ensures the current user is an administrator.
 
     Args:
-        plain_password (str): The plain password to verify.
-        hashed_password (str): The hashed password stored in the database.
+        current_user (User): The active user model instance obtained from the current request.
 
     Returns:
-        bool: True if the plain password matches the hashed password, False otherwise.
+        User: The administrator's user model instance.
+
+    Raises:
+        HTTPException: If the current user is not an administrator.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator rights required",
+        )
+    return current_user
 
 
-async def authenticate_user(username: str, password: str) -> str:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
-    Authenticates a user based on their username and password and returns a JWT access token.
+    Verifies the provided plain password against the stored hashed password.
 
     Args:
-        username (str): The username of the user trying to authenticate.
-        password (str): The password provided by the user.
+        plain_password (str): The plain password to verify.
+        hashed_password (str): The hashed password stored in the database.
 
     Returns:
-        str: The JWT access token if authentication is successful.
-
-    Raises:
-        HTTPException: If the provided username or password is incorrect.
+        bool: True if the plain password matches the hashed password, False otherwise.
     """
-    profile = await get_user(username)
-    if not profile or not await verify_password(
-        password, profile.hashed_password
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    access_token = create_jwt_token(data={"sub": profile.username})
-    return access_token
+    return pwd_context.verify(plain_password, hashed_password)
 
 
 async def create_jwt_token(data: dict, expires_minutes: int = 30) -> str:
@@ -158,3 +148,30 @@ async def create_jwt_token(data: dict, expires_minutes: int = 30) -> str:
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+
+def create_refresh_token() -> tuple[str, str]:
+    """
+    Creates a random refresh token.
+
+    Returns:
+        tuple[str, str]: The token handed to the client and the hash stored in the database.
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hashes a refresh token for storage and lookup.
+
+    Refresh tokens are random and long, so a fast hash is enough here, unlike
+    user-chosen passwords which need bcrypt.
+
+    Args:
+        token (str): The refresh token.
+
+    Returns:
+        str: The SHA-256 hex digest of the token.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
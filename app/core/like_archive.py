@@ -0,0 +1,333 @@
+import os
+import shutil
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from config import LIKE_ARCHIVE_DIR
+
+ArchivedLike = namedtuple(
+    "ArchivedLike", ["id", "user_id", "post_id", "is_liked", "created_at"]
+)
+
+COLUMNS = {
+    "id": np.int64,
+    "user_id": np.int32,
+    "post_id": np.int32,
+    "is_liked": np.bool_,
+    # Microseconds since 1970-01-01, UTC like the live created_at column.
+    "created_at": np.int64,
+}
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def to_microseconds(value: datetime) -> int:
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_microseconds(value: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(value))
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def next_month(value: date) -> date:
+    return (value.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+class ArchivedMonth:
+    """
+    The likes of one calendar month as memory-mapped columns.
+
+    Rows are sorted by (post_id, user_id), so a post's likes are one
+    contiguous slice and a single like is found by two binary searches.
+    Columns use the narrowest dtype holding their values, 21 bytes a like.
+
+    Attributes:
+        month (date): The first day of the month.
+        columns (dict[str, np.ndarray]): Read-only arrays keyed by column name.
+    """
+
+    def __init__(self, month: date, path: Path):
+        self.month = month
+        self.columns = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r")
+            for name in COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def in_range(self, start: int, end: int) -> np.ndarray | slice:
+        """
+        Selects the rows created within [start, end) microseconds.
+        """
+        created_at = self.columns["created_at"]
+        first = to_microseconds(
+            datetime.combine(self.month, datetime.min.time())
+        )
+        last = to_microseconds(
+            datetime.combine(next_month(self.month), datetime.min.time())
+        )
+        if start <= first and last <= end:
+            return slice(None)
+        return np.flatnonzero((created_at >= start) & (created_at < end))
+
+    def post_rows(self, post_id: int) -> slice:
+        post_ids = self.columns["post_id"]
+        return slice(
+            int(np.searchsorted(post_ids, post_id, "left")),
+            int(np.searchsorted(post_ids, post_id, "right")),
+        )
+
+    def find(self, user_id: int, post_id: int) -> int | None:
+        rows = self.post_rows(post_id)
+        user_ids = self.columns["user_id"][rows]
+        position = int(np.searchsorted(user_ids, user_id))
+        if position < len(user_ids) and user_ids[position] == user_id:
+            return rows.start + position
+        return None
+
+    def row(self, index: int) -> ArchivedLike:
+        return ArchivedLike(
+            id=int(self.columns["id"][index]),
+            user_id=int(self.columns["user_id"][index]),
+            post_id=int(self.columns["post_id"][index]),
+            is_liked=bool(self.columns["is_liked"][index]),
+            created_at=from_microseconds(self.columns["created_at"][index]),
+        )
+
+
+class LikeArchive:
+    """
+    Likes of closed months moved out of the database into columnar files.
+
+    Each month is a directory of one .npy file per column. It is written
+    complete under a hidden pending name and renamed into place, or
+    published, once its rows have been deleted from the database. Readers
+    never see a month that is still live: pending months are only read
+    once ``set_live_from`` reports that the oldest live like is newer.
+    Archived likes are immutable: they are read by analytics, like counts
+    and recommendations, but can no longer be removed.
+
+    Attributes:
+        directory (Path | None): Where months are stored, None when disabled.
+        months (dict[date, ArchivedMonth]): Published months by first day.
+        pending (dict[date, ArchivedMonth]): Written but unpublished months.
+        live_from (date): First month that may still have live likes.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory) if directory else None
+        self.months: dict[date, ArchivedMonth] = {}
+        self.pending: dict[date, ArchivedMonth] = {}
+        self.live_from = date.min
+        self._loaded_mtime = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def open(self):
+        """
+        Creates the directory if needed and loads the published months.
+        """
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.refresh()
+
+    def refresh(self):
+        """
+        Picks up months written or published by other processes since the
+        last call.
+
+        Both change the directory's modification time, so an unchanged
+        directory costs a single stat call.
+        """
+        if not self.enabled:
+            return
+        mtime = self.directory.stat().st_mtime_ns
+        if mtime == self._loaded_mtime:
+            return
+        months, pending = {}, {}
+        for path in sorted(self.directory.iterdir()):
+            if path.name.endswith(".pending"):
+                month = datetime.strptime(path.name[1:8], "%Y-%m").date()
+                pending[month] = self.pending.get(month) or ArchivedMonth(
+                    month, path
+                )
+            elif not path.name.startswith("."):
+                month = datetime.strptime(path.name, "%Y-%m").date()
+                months[month] = self.months.get(month) or ArchivedMonth(
+                    month, path
+                )
+        self.months = months
+        self.pending = {
+            month: archived
+            for month, archived in pending.items()
+            if month not in months
+        }
+        self._loaded_mtime = mtime
+
+    def set_live_from(self, first_like_time: datetime | None):
+        """
+        Records the creation time of the oldest live like, None if none.
+        """
+        self.live_from = (
+            month_start(first_like_time.date())
+            if first_like_time is not None
+            else date.max
+        )
+
+    def _readable(self) -> dict[date, ArchivedMonth]:
+        # Pending months whose rows are gone from every shard count as
+        # archived, since publishing them may still be in progress.
+        if not self.pending:
+            return self.months
+        deleted = {
+            month: archived
+            for month, archived in self.pending.items()
+            if month < self.live_from
+        }
+        return {**deleted, **self.months}
+
+    def _pending_path(self, month: date) -> Path:
+        return self.directory / f".{month.strftime('%Y-%m')}.pending"
+
+    def write_month(self, month: date, columns: dict[str, np.ndarray]):
+        """
+        Stores the likes of a month, sorted by (post_id, user_id), as
+        pending until ``publish_month`` is called.
+
+        The columns must hold every like of the month.
+        """
+        order = np.lexsort((columns["user_id"], columns["post_id"]))
+        temporary = self.directory / f".{month.strftime('%Y-%m')}.tmp"
+        pending = self._pending_path(month)
+        shutil.rmtree(temporary, ignore_errors=True)
+        temporary.mkdir()
+        for column, dtype in COLUMNS.items():
+            with open(temporary / f"{column}.npy", "wb") as file:
+                np.save(file, columns[column][order].astype(dtype))
+                file.flush()
+                os.fsync(file.fileno())
+        shutil.rmtree(pending, ignore_errors=True)
+        os.replace(temporary, pending)
+        self.pending[month] = ArchivedMonth(month, pending)
+
+    def publish_month(self, month: date):
+        path = self.directory / month.strftime("%Y-%m")
+        os.replace(self._pending_path(month), path)
+        self.months[month] = ArchivedMonth(month, path)
+        self.pending.pop(month, None)
+
+    def _months_overlapping(self, start: datetime, end: datetime):
+        for month, archived in sorted(self._readable().items()):
+            if month < end.date() and next_month(month) > start.date():
+                yield archived
+
+    @staticmethod
+    def _likes(archived: ArchivedMonth, rows) -> list[ArchivedLike]:
+        columns = archived.columns
+        return [
+            ArchivedLike(*values)
+            for values in zip(
+                columns["id"][rows].tolist(),
+                columns["user_id"][rows].tolist(),
+                columns["post_id"][rows].tolist(),
+                columns["is_liked"][rows].tolist(),
+                map(from_microseconds, columns["created_at"][rows].tolist()),
+            )
+        ]
+
+    def likes_in_range(self, start: datetime, end: datetime) -> list:
+        likes = []
+        for archived in self._months_overlapping(start, end):
+            rows = archived.in_range(
+                to_microseconds(start), to_microseconds(end)
+            )
+            likes += self._likes(archived, rows)
+        return likes
+
+    def stream_likes_in_range(
+        self, start: datetime, end: datetime, batch_size: int
+    ):
+        for archived in self._months_overlapping(start, end):
+            rows = archived.in_range(
+                to_microseconds(start), to_microseconds(end)
+            )
+            indices = np.arange(len(archived))[rows]
+            for offset in range(0, len(indices), batch_size):
+                yield self._likes(
+                    archived, indices[offset : offset + batch_size]
+                )
+
+    def stream_columns(
+        self,
+        names: tuple[str, ...],
+        start: datetime | None = None,
+        end: datetime | None = None,
+        batch_size: int = 1_000_000,
+    ):
+        """
+        Yields (n, len(names)) int64 arrays of the requested columns.
+
+        ``created_at`` is returned as a day number since 1970-01-01.
+        """
+        start = start or EPOCH
+        end = end or datetime.max
+        for archived in self._months_overlapping(start, end):
+            rows = archived.in_range(
+                to_microseconds(start), to_microseconds(end)
+            )
+            columns = []
+            for name in names:
+                values = archived.columns[name][rows].astype(np.int64)
+                if name == "created_at":
+                    values //= MICROSECONDS_PER_DAY
+                columns.append(values)
+            stacked = np.column_stack(columns)
+            for offset in range(0, len(stacked), batch_size):
+                yield stacked[offset : offset + batch_size]
+
+    def find(self, user_id: int, post_id: int) -> ArchivedLike | None:
+        for archived in self._readable().values():
+            index = archived.find(user_id, post_id)
+            if index is not None:
+                return archived.row(index)
+        return None
+
+    def count_likes(self, post_ids: list[int]) -> dict[int, int]:
+        ids = np.asarray(post_ids, dtype=np.int64)
+        totals = np.zeros(len(ids), dtype=np.int64)
+        for archived in self._readable().values():
+            archived_post_ids = archived.columns["post_id"]
+            totals += np.searchsorted(archived_post_ids, ids, "right")
+            totals -= np.searchsorted(archived_post_ids, ids, "left")
+        return {
+            post_id: count
+            for post_id, count in zip(ids.tolist(), totals.tolist())
+            if count
+        }
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "months": [
+                month.strftime("%Y-%m") for month in sorted(self.months)
+            ],
+            "likes": sum(len(archived) for archived in self.months.values()),
+            "pending": [
+                month.strftime("%Y-%m") for month in sorted(self.pending)
+            ],
+        }
+
+
+like_archive = LikeArchive(LIKE_ARCHIVE_DIR)
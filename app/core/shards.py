@@ -0,0 +1,114 @@
+from sqlalchemy import Column, Index, MetaData, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Like
+from config import DB_MAX_OVERFLOW, DB_POOL_SIZE, LIKE_SHARD_URLS
+
+# Users and posts live on the primary only, so the shard copy of the likes
+# table has the same columns without the foreign keys.
+shard_metadata = MetaData()
+shard_likes_table = Table(
+    Like.__tablename__,
+    shard_metadata,
+    *(
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            nullable=column.nullable,
+        )
+        for column in Like.__table__.columns
+    ),
+    Index("ix_likes_post_id_user_id", "post_id", "user_id", unique=True),
+    Index("ix_likes_created_at", "created_at"),
+)
+
+# Shard k of n hands out the like ids k + 1, k + 1 + n, k + 1 + 2n, ... so
+# that ids stay unique across shards. Likes stored before are renumbered
+# the same way; negating them first keeps the primary key unique meanwhile.
+LOCK_LIKES = text("LOCK TABLE likes IN EXCLUSIVE MODE")
+LIKE_ID_SEQUENCE = text("SELECT pg_get_serial_sequence('likes', 'id')")
+SEQUENCE_INCREMENT = text(
+    "SELECT seqincrement FROM pg_sequence "
+    "WHERE seqrelid = CAST(:sequence AS regclass)"
+)
+NEGATE_LIKE_IDS = text("UPDATE likes SET id = -id")
+INTERLEAVE_LIKE_IDS = text(
+    "UPDATE likes SET id = (-id - 1) * :shards + :offset"
+)
+SET_LIKE_ID_SEQUENCE = text(
+    "SELECT setval(CAST(:sequence AS regclass), "
+    "COALESCE(MAX(id), CAST(:offset AS integer) - :shards) + :shards, "
+    "false) FROM likes"
+)
+
+
+class LikeShards:
+    """
+    The databases holding likes when like sharding is enabled.
+
+    A like is stored on the shard chosen by a hash of its post id, so all
+    likes of one post live together. Changing the number of shards requires
+    moving the existing likes.
+
+    Attributes:
+        engines (list[AsyncEngine]): One engine per shard, in configuration order.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.engines = [
+            create_async_engine(
+                url, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW
+            )
+            for url in urls
+        ]
+        self._sessionmakers = [
+            sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            for engine in self.engines
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def shard_of(self, post_id: int) -> int:
+        # Fibonacci hashing spreads consecutive post ids across shards.
+        return (post_id * 0x9E3779B1 & 0xFFFFFFFF) % len(self.engines)
+
+    def session(self, shard: int) -> AsyncSession:
+        return self._sessionmakers[shard]()
+
+    async def create_tables(self):
+        for shard, engine in enumerate(self.engines):
+            async with engine.begin() as conn:
+                await conn.run_sync(shard_metadata.create_all)
+                await self._interleave_ids(conn, shard)
+
+    async def _interleave_ids(self, conn, shard: int):
+        await conn.execute(LOCK_LIKES)
+        sequence = (await conn.execute(LIKE_ID_SEQUENCE)).scalar()
+        increment = (
+            await conn.execute(SEQUENCE_INCREMENT, {"sequence": sequence})
+        ).scalar()
+        if increment == len(self.engines):
+            return
+        params = {"shards": len(self.engines), "offset": shard + 1}
+        await conn.execute(NEGATE_LIKE_IDS)
+        await conn.execute(INTERLEAVE_LIKE_IDS, params)
+        await conn.execute(
+            SET_LIKE_ID_SEQUENCE, {"sequence": sequence, **params}
+        )
+        await conn.execute(
+            text(f"ALTER SEQUENCE {sequence} INCREMENT BY {params['shards']}")
+        )
+
+    async def dispose(self):
+        for engine in self.engines:
+            await engine.dispose()
+
+
+like_shards = LikeShards(LIKE_SHARD_URLS)
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.token_serializer import Token
+from app.core.database import engine
+from app.repositories.like_repository import LikeRepository
+from app.repositories.post_repository import PostRepository
+from app.repositories.user_repository import UserRepository
+from app.serializers.like_serializer import LikeAdd
+from app.serializers.post_serializer import PostLikeCount, PostResponse
+from app.serializers.user_serializer import UserResponse
+
+
+async def _prime_connection():
+    # asyncpg prepares and caches statements per connection, so the hot
+    # queries are run once on every pooled connection. get_like_counts is
+    # coalesced across concurrent callers, which would leave all but one
+    # connection unprimed, so its uncoalesced query is run instead.
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        session = AsyncSession(bind=conn)
+        await UserRepository(session).get_profile_by_username("")
+        await UserRepository(session).get_activity(0)
+        await PostRepository(session).count_live_likes([0])
+        await LikeRepository(session).get_like(0, 0)
+        await session.close()
+        await conn.rollback()
+
+
+def _prime_serializers():
+    now = datetime.utcnow()
+    LikeAdd(
+        id=0, user_id=0, post_id=0, is_liked=True, created_at=now
+    ).model_dump_json()
+    PostResponse(id=0, title="", content="", author="").model_dump_json()
+    PostLikeCount(post_id=0, likes_count=0).model_dump_json()
+    UserResponse(
+        id=0, username="", full_name="", email="user@example.com"
+    ).model_dump_json()
+    Token(access_token="", token_type="bearer").model_dump_json()
+
+
+async def warm_up(connections: int):
+    """
+    Opens ``connections`` pool connections and primes hot statements and serializers.
+    """
+    await asyncio.gather(*(_prime_connection() for _ in range(connections)))
+    _prime_serializers()
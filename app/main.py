@@ -1,14 +1,108 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api import api_router
 from app.core.database import engine, Base
+from app.core.like_archive import like_archive
+from app.core.shards import like_shards
+from app.core.warmup import warm_up
+from app.services.like_archival import (
+    archive_likes_periodically,
+    refresh_archive_periodically,
+)
+from app.services.like_stream import like_count_broadcaster
+from app.services.post_filter import (
+    load_post_ids,
+    refresh_post_ids_periodically,
+)
+from app.services.recommendation_service import (
+    rebuild_recommendations_periodically,
+)
+from app.utils.admission import AdmissionMiddleware, admission_controller
+from app.utils.cache import entity_cache
+from app.utils.invalidation import invalidation_bus
+from app.utils.job_queue import job_queue
+from app.utils.lifecycle import LifecycleMiddleware, lifecycle
+from app.utils.profiler import ProfilingMiddleware, profiler
+from config import (
+    DB_POOL_SIZE,
+    PROFILER_ROUTE,
+    PROFILER_TOKEN,
+    REPOSITORY_BACKEND,
+    SHUTDOWN_DRAIN_TIMEOUT,
+)
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-app.include_router(api_router)
 
+def start_draining():
+    """
+    Refuses new requests and ends the like count streams.
+
+    uvicorn only runs the lifespan shutdown once every connection has
+    closed, so app.server calls this as soon as the stop signal arrives;
+    otherwise one open stream would keep the worker alive forever.
+    """
+    lifecycle.start_draining()
+    like_count_broadcaster.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The memory backend keeps everything in this process, so there is no
+    # schema, pool, archive or other worker to talk to.
+    use_database = REPOSITORY_BACKEND != "memory"
+    if use_database:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await like_shards.create_tables()
+        like_archive.open()
+        await warm_up(DB_POOL_SIZE)
+
+    app.openapi()
+    await job_queue.start()
+    await load_post_ids()
+    background_tasks = [
+        asyncio.create_task(refresh_post_ids_periodically()),
+        asyncio.create_task(rebuild_recommendations_periodically()),
+        asyncio.create_task(like_count_broadcaster.run()),
+    ]
+    if use_database:
+        background_tasks += [
+            asyncio.create_task(archive_likes_periodically()),
+            asyncio.create_task(refresh_archive_periodically()),
+            asyncio.create_task(invalidation_bus.run()),
+        ]
+    lifecycle.ready = True
 
-@app.on_event("startup")
-async def init_models():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    yield
+
+    start_draining()
+    if not await lifecycle.drain(SHUTDOWN_DRAIN_TIMEOUT):
+        logger.warning(
+            "Shutting down with %s requests in flight", lifecycle.in_flight
+        )
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await job_queue.stop()
+    await invalidation_bus.close()
+    await entity_cache.close()
+    await like_shards.dispose()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(api_router)
+app.add_middleware(
+    ProfilingMiddleware,
+    profiler=profiler,
+    route=PROFILER_ROUTE,
+    token=PROFILER_TOKEN,
+)
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+app.add_middleware(LifecycleMiddleware, lifecycle=lifecycle)
@@ -2,3 +2,5 @@ from app.core.database import Base
 from app.models.user_model import *
 from app.models.post_model import *
 from app.models.like_model import *
+from app.models.refresh_token_model import *
+from app.models.daily_like_stats_model import *
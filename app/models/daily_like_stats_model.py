@@ -0,0 +1,14 @@
+__all__ = ["DailyLikeStats"]
+
+from sqlalchemy import Column, Date, Integer, LargeBinary
+from app.core.database import Base
+
+
+class DailyLikeStats(Base):
+    __tablename__ = "daily_like_stats"
+
+    day = Column(Date, primary_key=True)
+    likes_count = Column(Integer, nullable=False)
+    users_count = Column(Integer, nullable=False)
+    # HyperLogLog registers of the users who liked something that day.
+    users_sketch = Column(LargeBinary, nullable=False)
@@ -1,6 +1,6 @@
 __all__ = ["Like"]
 
-from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -15,5 +15,9 @@ class Like(Base):
     is_liked = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("uq_likes_user_id_post_id", "user_id", "post_id", unique=True),
+    )
+
     post = relationship("Post", back_populates="likes")
     user = relationship("User", back_populates="likes")
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import timedelta
+
+from app.core.like_archive import LikeArchive
+
+
+async def track_live_from(archive: LikeArchive, live_repo):
+    """
+    Lets the archive read the pending months whose live rows are gone.
+    """
+    if archive.pending:
+        archive.set_live_from(await live_repo.get_first_like_time())
+
+
+class ArchivedLikeRepository:
+    """
+    Like repository whose reads cover both the live likes and the archive.
+
+    Writes go to the live repository only. A month is read from the archive
+    only once its rows are deleted from every live table, so the two never
+    overlap. The archiver announces a month once it is written, before
+    deleting its rows; a process that has not received that notification,
+    nor rescanned the archive within LIKE_ARCHIVE_REFRESH_SECONDS, misses
+    the month's likes until it does, rather than counting them twice.
+    """
+
+    def __init__(self, live_repo, archive: LikeArchive):
+        self.live_repo = live_repo
+        self.archive = archive
+
+    async def create_like(self, user_id: int, post_id: int):
+        return await self.live_repo.create_like(user_id, post_id)
+
+    async def delete_like(self, user_id: int, post_id: int):
+        await self.live_repo.delete_like(user_id, post_id)
+
+    async def get_like(self, user_id: int, post_id: int):
+        like = await self.live_repo.get_like(user_id, post_id)
+        if like is not None:
+            return like
+        await track_live_from(self.archive, self.live_repo)
+        archived = self.archive.find(user_id, post_id)
+        # Shaped like the row returned for a live like.
+        return (archived,) if archived is not None else None
+
+    async def get_likes_in_date_range_by_shard(self, date_from, date_to):
+        by_shard = await self.live_repo.get_likes_in_date_range_by_shard(
+            date_from, date_to
+        )
+        await track_live_from(self.archive, self.live_repo)
+        archived = await asyncio.to_thread(
+            self.archive.likes_in_range,
+            date_from,
+            date_to + timedelta(days=1),
+        )
+        return [*by_shard, archived]
+
+    async def get_likes_in_date_range(self, date_from, date_to):
+        by_shard = await self.get_likes_in_date_range_by_shard(
+            date_from, date_to
+        )
+        return [like for likes in by_shard for like in likes]
+
+    async def count_likes(self, post_ids: list[int]) -> dict[int, int]:
+        counts = await self.live_repo.count_likes(post_ids)
+        await track_live_from(self.archive, self.live_repo)
+        for post_id, archived in self.archive.count_likes(post_ids).items():
+            counts[post_id] = counts.get(post_id, 0) + archived
+        return counts
+
+    async def get_first_like_time(self):
+        return await self.live_repo.get_first_like_time()
+
+    async def delete_likes_in_date_range(self, date_from, date_to):
+        await self.live_repo.delete_likes_in_date_range(date_from, date_to)
+
+    async def stream_likes_in_date_range(
+        self, date_from, date_to, batch_size: int
+    ):
+        await track_live_from(self.archive, self.live_repo)
+        for rows in self.archive.stream_likes_in_range(
+            date_from, date_to, batch_size
+        ):
+            yield rows
+        async for rows in self.live_repo.stream_likes_in_date_range(
+            date_from, date_to, batch_size
+        ):
+            yield rows
+
+    async def stream_like_pairs(self, batch_size: int = 50_000):
+        # Archived batches are integer arrays rather than rows.
+        await track_live_from(self.archive, self.live_repo)
+        for rows in self.archive.stream_columns(("user_id", "post_id")):
+            yield rows
+        async for rows in self.live_repo.stream_like_pairs(batch_size):
+            yield rows
+
+    async def stream_like_days(
+        self, date_from, date_to, batch_size: int = 100_000
+    ):
+        await track_live_from(self.archive, self.live_repo)
+        for rows in self.archive.stream_columns(
+            ("user_id", "created_at"), date_from, date_to
+        ):
+            yield rows
+        async for rows in self.live_repo.stream_like_days(
+            date_from, date_to, batch_size
+        ):
+            yield rows
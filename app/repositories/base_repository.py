@@ -1,8 +1,12 @@
+from types import SimpleNamespace
 from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import Select, insert
 from sqlalchemy import delete
 
+from app.utils.cache import entity_cache
+from app.utils.invalidation import invalidation_bus
+
 
 class BaseRepository:
     model: Any = None
@@ -15,6 +19,8 @@ class BaseRepository:
         response = await self.session.execute(query, new_obj)
         await self.session.commit()
         new_obj = response.scalar()
+        await entity_cache.invalidate(self.model.__tablename__, new_obj.id)
+        invalidation_bus.publish(self.model.__tablename__, new_obj.id)
         return new_obj
 
     async def exists(self, query: Select):
@@ -24,16 +30,34 @@ class BaseRepository:
         result = response.first()
         return bool(result)
 
-    async def get_one(self, query: Select):
-        response = await self.session.execute(query)
+    async def get_one(self, query: Select, params: dict | None = None):
+        response = await self.session.execute(query, params)
         result = response.first()
         return result
 
+    async def get_one_cached(
+        self,
+        namespace: str,
+        obj_id: int,
+        query: Select,
+        params: dict | None = None,
+    ):
+        async def load():
+            row = await self.get_one(query, params)
+            return row._asdict() if row is not None else None
+
+        data = await entity_cache.get_or_load(namespace, obj_id, load)
+        return SimpleNamespace(**data) if data is not None else None
+
     async def delete(self, obj_id: int):
         query = delete(self.model).where(self.model.id == obj_id)
         await self.session.execute(query)
         await self.session.commit()
+        await entity_cache.invalidate(self.model.__tablename__, obj_id)
+        invalidation_bus.publish(self.model.__tablename__, obj_id)
 
     async def save(self, obj: Any):
         self.session.add(obj)
         await self.session.commit()
+        await entity_cache.invalidate(obj.__tablename__, obj.id)
+        invalidation_bus.publish(obj.__tablename__, obj.id)
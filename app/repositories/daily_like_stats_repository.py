@@ -0,0 +1,36 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models import DailyLikeStats
+from app.repositories.base_repository import BaseRepository
+
+
+class DailyLikeStatsRepository(BaseRepository):
+    model = DailyLikeStats
+
+    async def get_days(self, date_from, date_to):
+        query = select(self.model).where(
+            self.model.day >= date_from, self.model.day < date_to
+        )
+        response = await self.session.execute(query)
+        return response.scalars().all()
+
+    async def save_days(self, rows: list[dict]):
+        if not rows:
+            return
+        query = insert(self.model).values(rows)
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.day],
+            set_={
+                "likes_count": query.excluded.likes_count,
+                "users_count": query.excluded.users_count,
+                "users_sketch": query.excluded.users_sketch,
+            },
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def delete_days(self, days):
+        query = delete(self.model).where(self.model.day.in_(days))
+        await self.session.execute(query)
+        await self.session.commit()
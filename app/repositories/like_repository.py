@@ -1,28 +1,152 @@
-from sqlalchemy import delete, select, and_, func
+from datetime import datetime
+
+from sqlalchemy import (
+    delete,
+    select,
+    and_,
+    func,
+    cast,
+    true,
+    Integer,
+    DateTime,
+    bindparam,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 from app.models import Like
 from app.repositories.base_repository import BaseRepository
+from app.utils.group_commit import GroupCommit
+from app.utils.invalidation import invalidation_bus
+from config import (
+    LIKE_GROUP_COMMIT,
+    LIKE_GROUP_COMMIT_MAX_BATCH,
+    LIKE_GROUP_COMMIT_MAX_DELAY,
+)
+
+# Namespace of the invalidations of a post's like count.
+LIKE_COUNTS_NAMESPACE = "like_counts"
+
+# Hot statements are built once with bound parameters: each call skips
+# constructing the statement, its cache key is memoized and the SQL text
+# stays identical, so asyncpg reuses the prepared statement.
+LIKE_BY_USER_AND_POST = select(Like).where(
+    Like.user_id == bindparam("user_id"), Like.post_id == bindparam("post_id")
+)
+# One statement inserts any number of likes: the rows arrive as arrays, so
+# the SQL text and its prepared statement do not depend on the batch size.
+# A like that already exists is skipped and returns no row.
+_new_likes = (
+    func.unnest(
+        cast(bindparam("user_ids"), ARRAY(Integer)),
+        cast(bindparam("post_ids"), ARRAY(Integer)),
+        cast(bindparam("created_ats"), ARRAY(DateTime)),
+    )
+    .table_valued("user_id", "post_id", "created_at")
+    .render_derived()
+)
+INSERT_LIKES = (
+    insert(Like.__table__)
+    .from_select(
+        ["user_id", "post_id", "is_liked", "created_at"],
+        select(
+            _new_likes.c.user_id,
+            _new_likes.c.post_id,
+            true(),
+            _new_likes.c.created_at,
+        ),
+    )
+    .on_conflict_do_nothing(index_elements=["user_id", "post_id"])
+    .returning(*Like.__table__.columns)
+)
+DELETE_LIKE = (
+    delete(Like)
+    .where(
+        Like.user_id == bindparam("user_id"),
+        Like.post_id == bindparam("post_id"),
+    )
+    .execution_options(synchronize_session=False)
+)
+
+
+def _insert_params(likes: list[tuple[int, int, datetime]]) -> dict:
+    user_ids, post_ids, created_ats = zip(*likes)
+    return {
+        "user_ids": list(user_ids),
+        "post_ids": list(post_ids),
+        "created_ats": list(created_ats),
+    }
+
+
+async def insert_like_batch(engine: AsyncEngine, likes: list[tuple]):
+    # A like submitted twice in one batch is inserted once, for the first.
+    unique_likes = list({like[:2]: like for like in reversed(likes)}.values())
+    async with engine.begin() as conn:
+        response = await conn.execute(
+            INSERT_LIKES, _insert_params(unique_likes)
+        )
+        inserted = {(row.user_id, row.post_id): row for row in response}
+    return [inserted.pop(like[:2], None) for like in likes]
+
+
+_group_commits: dict[AsyncEngine, GroupCommit] = {}
+
+
+def get_group_commit(engine: AsyncEngine) -> GroupCommit:
+    """
+    Returns the like insert batcher of a database, one per engine.
+    """
+    group_commit = _group_commits.get(engine)
+    if group_commit is None:
+        group_commit = GroupCommit(
+            lambda likes: insert_like_batch(engine, likes),
+            max_batch=LIKE_GROUP_COMMIT_MAX_BATCH,
+            max_delay=LIKE_GROUP_COMMIT_MAX_DELAY,
+        )
+        _group_commits[engine] = group_commit
+    return group_commit
+
+
+def group_commit_stats() -> dict:
+    return {
+        "enabled": LIKE_GROUP_COMMIT,
+        "databases": [
+            {"database": engine.url.database, **group_commit.stats()}
+            for engine, group_commit in _group_commits.items()
+        ],
+    }
 
 
 class LikeRepository(BaseRepository):
     model = Like
 
     async def create_like(self, user_id: int, post_id: int):
-        like_data = {"user_id": user_id, "post_id": post_id, "is_liked": True}
-        return await self.create(like_data)
+        # Returns None if the user already liked the post. With group commit
+        # concurrent likes share one transaction instead of a commit each.
+        like = (user_id, post_id, datetime.utcnow())
+        if LIKE_GROUP_COMMIT:
+            row = await get_group_commit(self.session.bind).submit(like)
+        else:
+            response = await self.session.execute(
+                INSERT_LIKES, _insert_params([like])
+            )
+            await self.session.commit()
+            row = response.first()
+        if row is not None:
+            invalidation_bus.publish(LIKE_COUNTS_NAMESPACE, post_id)
+        return row
 
     async def delete_like(self, user_id: int, post_id: int):
-        query = delete(Like).where(
-            Like.user_id == user_id, Like.post_id == post_id
+        await self.session.execute(
+            DELETE_LIKE, {"user_id": user_id, "post_id": post_id}
         )
-        await self.session.execute(query)
         await self.session.commit()
+        invalidation_bus.publish(LIKE_COUNTS_NAMESPACE, post_id)
 
     async def get_like(self, user_id: int, post_id: int):
-        query = select(Like).filter(
-            Like.user_id == user_id, Like.post_id == post_id
+        return await self.get_one(
+            LIKE_BY_USER_AND_POST, {"user_id": user_id, "post_id": post_id}
         )
-        return await self.get_one(query)
 
     async def get_likes_in_date_range(self, date_from, date_to):
         query = select(self.model).filter(
@@ -34,3 +158,79 @@ class LikeRepository(BaseRepository):
         response = await self.session.execute(query)
         likes = response.scalars().all()
         return likes
+
+    async def get_likes_in_date_range_by_shard(self, date_from, date_to):
+        return [await self.get_likes_in_date_range(date_from, date_to)]
+
+    async def count_likes(self, post_ids: list[int]) -> dict[int, int]:
+        query = (
+            select(self.model.post_id, func.count(self.model.id))
+            .where(self.model.post_id.in_(post_ids))
+            .group_by(self.model.post_id)
+        )
+        response = await self.session.execute(query)
+        return {post_id: likes_count for post_id, likes_count in response}
+
+    async def get_first_like_time(self):
+        query = select(func.min(self.model.created_at))
+        response = await self.session.execute(query)
+        return response.scalar()
+
+    async def delete_likes_in_date_range(self, date_from, date_to):
+        query = delete(self.model).where(
+            self.model.created_at >= date_from,
+            self.model.created_at < date_to,
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def stream_likes_in_date_range(
+        self, date_from, date_to, batch_size: int
+    ):
+        query = (
+            select(
+                self.model.id,
+                self.model.user_id,
+                self.model.post_id,
+                self.model.is_liked,
+                self.model.created_at,
+            )
+            .where(
+                self.model.created_at >= date_from,
+                self.model.created_at < date_to,
+            )
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        response = await self.session.stream(query)
+        async for rows in response.partitions():
+            yield rows
+
+    async def stream_like_pairs(self, batch_size: int = 50_000):
+        query = select(
+            self.model.user_id, self.model.post_id
+        ).execution_options(yield_per=batch_size)
+        response = await self.session.stream(query)
+        async for rows in response.partitions():
+            yield rows
+
+    async def stream_like_days(
+        self, date_from, date_to, batch_size: int = 100_000
+    ):
+        # Days since 1970-01-01 come back as plain integers, which keeps the
+        # rows cheap to decode into numpy arrays.
+        day = cast(
+            func.floor(func.extract("epoch", self.model.created_at) / 86400),
+            Integer,
+        )
+        query = (
+            select(self.model.user_id, day)
+            .where(
+                self.model.created_at >= date_from,
+                self.model.created_at < date_to,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        response = await self.session.stream(query)
+        async for rows in response.partitions():
+            yield rows
@@ -0,0 +1,25 @@
+from typing import Any
+
+from app.repositories.memory.store import MemoryStore
+
+
+class MemoryBaseRepository:
+    model: Any = None
+
+    def __init__(self, store: MemoryStore):
+        self.store = store
+
+    @property
+    def rows(self) -> dict:
+        return self.store.tables[self.model.__tablename__]
+
+    async def create(self, new_obj: dict):
+        obj = self.model(**new_obj)
+        self.store.insert(obj)
+        return obj
+
+    async def delete(self, obj_id: int):
+        self.store.delete(self.model.__tablename__, obj_id)
+
+    async def save(self, obj: Any):
+        self.store.save(obj)
@@ -0,0 +1,21 @@
+from app.models import DailyLikeStats
+from app.repositories.memory.base_repository import MemoryBaseRepository
+
+
+class MemoryDailyLikeStatsRepository(MemoryBaseRepository):
+    model = DailyLikeStats
+
+    async def get_days(self, date_from, date_to):
+        return [
+            stats
+            for day, stats in sorted(self.rows.items())
+            if date_from <= day < date_to
+        ]
+
+    async def save_days(self, rows: list[dict]):
+        for stats in rows:
+            self.store.save(self.model(**stats))
+
+    async def delete_days(self, days):
+        for day in days:
+            self.store.delete(self.model.__tablename__, day)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+from app.models import Like
+from app.repositories.memory.base_repository import MemoryBaseRepository
+from app.repositories.memory.store import batches, day_number, day_start, row
+
+
+class MemoryLikeRepository(MemoryBaseRepository):
+    model = Like
+
+    def _likes_between(self, date_from, date_to) -> list[Like]:
+        return [
+            self.rows[like_id]
+            for like_id in self.store.like_ids_between(date_from, date_to)
+        ]
+
+    async def create_like(self, user_id: int, post_id: int):
+        # Returns None if the user already liked the post.
+        like = self.model(
+            user_id=user_id,
+            post_id=post_id,
+            is_liked=True,
+            created_at=datetime.utcnow(),
+        )
+        if not self.store.insert(like, on_conflict_do_nothing=True):
+            return None
+        return row(
+            id=like.id,
+            user_id=like.user_id,
+            post_id=like.post_id,
+            is_liked=like.is_liked,
+            created_at=like.created_at,
+        )
+
+    async def delete_like(self, user_id: int, post_id: int):
+        like_id = self.store.likes_by_pair.get((user_id, post_id))
+        if like_id is not None:
+            self.store.delete(self.model.__tablename__, like_id)
+
+    async def get_like(self, user_id: int, post_id: int):
+        like_id = self.store.likes_by_pair.get((user_id, post_id))
+        # Shaped like the row of a select of the whole entity.
+        return (self.rows[like_id],) if like_id is not None else None
+
+    async def get_likes_in_date_range(self, date_from, date_to):
+        # Whole days, as func.date(created_at) compares them in SQL.
+        return self._likes_between(
+            day_start(date_from), day_start(date_to) + timedelta(days=1)
+        )
+
+    async def get_likes_in_date_range_by_shard(self, date_from, date_to):
+        return [await self.get_likes_in_date_range(date_from, date_to)]
+
+    async def count_likes(self, post_ids: list[int]) -> dict[int, int]:
+        return {
+            post_id: self.store.like_counts[post_id]
+            for post_id in post_ids
+            if post_id in self.store.like_counts
+        }
+
+    async def get_first_like_time(self):
+        if not self.store.likes_by_time:
+            return None
+        return self.store.likes_by_time[0][0]
+
+    async def delete_likes_in_date_range(self, date_from, date_to):
+        for like_id in self.store.like_ids_between(date_from, date_to):
+            self.store.delete(self.model.__tablename__, like_id)
+
+    async def stream_likes_in_date_range(
+        self, date_from, date_to, batch_size: int
+    ):
+        likes = sorted(
+            self._likes_between(date_from, date_to), key=lambda like: like.id
+        )
+        for chunk in batches(likes, batch_size):
+            yield [
+                row(
+                    id=like.id,
+                    user_id=like.user_id,
+                    post_id=like.post_id,
+                    is_liked=like.is_liked,
+                    created_at=like.created_at,
+                )
+                for like in chunk
+            ]
+
+    async def stream_like_pairs(self, batch_size: int = 50_000):
+        pairs = list(self.store.likes_by_pair)
+        for chunk in batches(pairs, batch_size):
+            yield chunk
+
+    async def stream_like_days(
+        self, date_from, date_to, batch_size: int = 100_000
+    ):
+        days = [
+            (like.user_id, day_number(like.created_at))
+            for like in self._likes_between(date_from, date_to)
+        ]
+        for chunk in batches(days, batch_size):
+            yield chunk
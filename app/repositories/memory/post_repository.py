@@ -0,0 +1,95 @@
+import re
+from collections import Counter
+
+from app.models import Post
+from app.repositories.memory.base_repository import MemoryBaseRepository
+from app.repositories.memory.store import batches, row
+
+WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> list[str]:
+    return WORD.findall(text.lower())
+
+
+class MemoryPostRepository(MemoryBaseRepository):
+    model = Post
+
+    async def get_posts_by_user_id(self, user_id: int):
+        post_ids = sorted(self.store.post_ids_by_user.get(user_id, ()))
+        return [self.rows[post_id] for post_id in post_ids]
+
+    async def get_user_by_id(self, user_id: int):
+        return self.store.users.get(user_id)
+
+    async def get_post_by_id(self, post_id: int):
+        return self.rows.get(post_id)
+
+    async def get_like_counts(self, post_ids: list[int]) -> dict[int, int]:
+        return {
+            post_id: self.store.like_counts.get(post_id, 0)
+            for post_id in post_ids
+            if post_id in self.rows
+        }
+
+    async def search(
+        self,
+        text: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ):
+        # Stands in for full text search: every query word must occur in
+        # the post, which ranks higher the denser the query words are.
+        terms = set(_words(text))
+        if not terms:
+            return []
+        results = []
+        for post in self.rows.values():
+            words = _words(f"{post.title} {post.content}")
+            counts = Counter(words)
+            if not all(counts[term] for term in terms):
+                continue
+            rank = sum(counts[term] for term in terms) / len(words)
+            if after is not None and (rank, post.id) >= after:
+                continue
+            results.append(
+                row(
+                    id=post.id,
+                    title=post.title,
+                    content=post.content,
+                    created_at=post.created_at,
+                    rank=rank,
+                )
+            )
+        results.sort(key=lambda result: (result.rank, result.id), reverse=True)
+        return results[:limit]
+
+    async def stream_posts_in_date_range(
+        self, date_from, date_to, batch_size: int
+    ):
+        posts = sorted(
+            (
+                post
+                for post in self.rows.values()
+                if date_from <= post.created_at < date_to
+            ),
+            key=lambda post: post.created_at,
+        )
+        for chunk in batches(posts, batch_size):
+            yield [
+                row(
+                    id=post.id,
+                    user_id=post.user_id,
+                    title=post.title,
+                    content=post.content,
+                    created_at=post.created_at,
+                )
+                for post in chunk
+            ]
+
+    async def stream_post_ids(self, after_id: int, batch_size: int = 10_000):
+        post_ids = sorted(
+            post_id for post_id in self.rows if post_id > after_id
+        )
+        for chunk in batches(post_ids, batch_size):
+            yield chunk
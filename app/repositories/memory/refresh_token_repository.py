@@ -0,0 +1,59 @@
+import datetime
+
+from app.models import RefreshToken
+from app.repositories.memory.base_repository import MemoryBaseRepository
+
+
+class MemoryRefreshTokenRepository(MemoryBaseRepository):
+    model = RefreshToken
+
+    def _active(self, token_hash: str, now: datetime.datetime | None = None):
+        token = self.rows.get(
+            self.store.refresh_tokens_by_hash.get(token_hash)
+        )
+        if token is None or token.revoked_at is not None:
+            return None
+        if now is not None and token.expires_at <= now:
+            return None
+        return token
+
+    async def create_token(
+        self, user_id: int, token_hash: str, expires_at: datetime.datetime
+    ):
+        self.store.insert(
+            self.model(
+                user_id=user_id,
+                token_hash=token_hash,
+                created_at=datetime.datetime.utcnow(),
+                expires_at=expires_at,
+            )
+        )
+
+    async def rotate(
+        self,
+        token_hash: str,
+        new_token_hash: str,
+        expires_at: datetime.datetime,
+    ):
+        now = datetime.datetime.utcnow()
+        token = self._active(token_hash, now)
+        if token is None:
+            return None
+        token.revoked_at = now
+        self.store.insert(
+            self.model(
+                user_id=token.user_id,
+                token_hash=new_token_hash,
+                created_at=now,
+                expires_at=expires_at,
+            )
+        )
+        user = self.store.users.get(token.user_id)
+        return user.username if user is not None else None
+
+    async def revoke(self, token_hash: str) -> bool:
+        token = self._active(token_hash)
+        if token is None:
+            return False
+        token.revoked_at = datetime.datetime.utcnow()
+        return True
@@ -0,0 +1,225 @@
+import functools
+import itertools
+from bisect import bisect_left, insort
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from sqlalchemy.exc import IntegrityError
+
+from app.models import DailyLikeStats, Like, Post, RefreshToken, User
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _row_type(fields: tuple[str, ...]):
+    class Row(namedtuple("Row", fields)):
+        __slots__ = ()
+
+        @property
+        def _mapping(self):
+            return self._asdict()
+
+    return Row
+
+
+def row(**values):
+    """
+    Builds a row read by attribute, by index or through ``_mapping`` and
+    ``_asdict()``, like the rows of column selects.
+    """
+    return _row_type(tuple(values))(**values)
+
+
+def day_start(value) -> datetime:
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, time())
+
+
+def day_number(value: datetime) -> int:
+    # Days since 1970-01-01, as stream_like_days computes them in SQL.
+    return (value - EPOCH) // timedelta(days=1)
+
+
+def batches(items: list, batch_size: int):
+    for offset in range(0, len(items), batch_size):
+        yield items[offset : offset + batch_size]
+
+
+class MemoryStore:
+    """
+    In-memory tables shared by the memory repositories.
+
+    Rows are model instances kept in dicts by primary key, next to the
+    indexes the repositories look them up by: unique keys, the posts of each
+    user, like counts per post and the likes sorted by creation time.
+    Repository methods never await while they change the store, so each one
+    is atomic on the event loop, as a transaction would be.
+
+    Unique and foreign keys are checked on insert and raise IntegrityError,
+    as the database would. Indexed columns are assumed never to change on a
+    stored instance; replace it through ``save`` instead.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.tables: dict[str, dict[Any, Any]] = {
+            User.__tablename__: {},
+            Post.__tablename__: {},
+            Like.__tablename__: {},
+            RefreshToken.__tablename__: {},
+            DailyLikeStats.__tablename__: {},
+        }
+        self.users_by_username: dict[str, int] = {}
+        self.users_by_email: dict[str, int] = {}
+        self.post_ids_by_user: dict[int, set[int]] = {}
+        self.likes_by_pair: dict[tuple[int, int], int] = {}
+        self.like_counts: dict[int, int] = {}
+        # (created_at, id) of every like, in order.
+        self.likes_by_time: list[tuple[datetime, int]] = []
+        self.refresh_tokens_by_hash: dict[str, int] = {}
+        self._sequences = {table: itertools.count(1) for table in self.tables}
+
+    @property
+    def users(self) -> dict[int, User]:
+        return self.tables[User.__tablename__]
+
+    @property
+    def posts(self) -> dict[int, Post]:
+        return self.tables[Post.__tablename__]
+
+    @property
+    def likes(self) -> dict[int, Like]:
+        return self.tables[Like.__tablename__]
+
+    @property
+    def refresh_tokens(self) -> dict[int, RefreshToken]:
+        return self.tables[RefreshToken.__tablename__]
+
+    @property
+    def daily_like_stats(self) -> dict[date, DailyLikeStats]:
+        return self.tables[DailyLikeStats.__tablename__]
+
+    def _unique_keys(self, obj) -> list[tuple[dict, Any]]:
+        if isinstance(obj, User):
+            return [
+                (self.users_by_username, obj.username),
+                (self.users_by_email, obj.email),
+            ]
+        if isinstance(obj, Like):
+            return [(self.likes_by_pair, (obj.user_id, obj.post_id))]
+        if isinstance(obj, RefreshToken):
+            return [(self.refresh_tokens_by_hash, obj.token_hash)]
+        return []
+
+    def _references(self, obj) -> list[tuple[dict, Any]]:
+        if isinstance(obj, (Post, RefreshToken)):
+            return [(self.users, obj.user_id)]
+        if isinstance(obj, Like):
+            return [(self.users, obj.user_id), (self.posts, obj.post_id)]
+        return []
+
+    @staticmethod
+    def _key(obj):
+        if isinstance(obj, DailyLikeStats):
+            return obj.day
+        return obj.id
+
+    def conflicts(self, obj) -> bool:
+        key = self._key(obj)
+        return any(
+            index.get(value, key) != key
+            for index, value in self._unique_keys(obj)
+            if value is not None
+        )
+
+    def insert(self, obj, on_conflict_do_nothing: bool = False) -> bool:
+        """
+        Stores a new row, assigning its id. Returns False when it conflicts
+        with a stored row and ``on_conflict_do_nothing`` is set.
+        """
+        table = obj.__tablename__
+        if self._key(obj) is None:
+            obj.id = next(self._sequences[table])
+        if self.conflicts(obj):
+            if on_conflict_do_nothing:
+                return False
+            raise IntegrityError(
+                f"INSERT INTO {table}", None, ValueError("duplicate key")
+            )
+        for rows, key in self._references(obj):
+            if key not in rows:
+                raise IntegrityError(
+                    f"INSERT INTO {table}",
+                    None,
+                    ValueError("missing reference"),
+                )
+        self.save(obj)
+        return True
+
+    def save(self, obj):
+        """
+        Stores a row, replacing the stored row with the same key.
+        """
+        table = obj.__tablename__
+        if self._key(obj) is None:
+            self.insert(obj)
+            return
+        rows = self.tables[table]
+        key = self._key(obj)
+        stored = rows.get(key)
+        if stored is obj:
+            return
+        if stored is not None:
+            self._unindex(stored)
+        rows[key] = obj
+        self._index(obj)
+
+    def delete(self, table: str, key) -> Any:
+        obj = self.tables[table].pop(key, None)
+        if obj is not None:
+            self._unindex(obj)
+        return obj
+
+    def _index(self, obj):
+        key = self._key(obj)
+        for index, value in self._unique_keys(obj):
+            if value is not None:
+                index[value] = key
+        if isinstance(obj, Post):
+            self.post_ids_by_user.setdefault(obj.user_id, set()).add(key)
+        elif isinstance(obj, Like):
+            self.like_counts[obj.post_id] = (
+                self.like_counts.get(obj.post_id, 0) + 1
+            )
+            # Likes mostly arrive in time order, so this is an append.
+            insort(self.likes_by_time, (obj.created_at, key))
+
+    def _unindex(self, obj):
+        key = self._key(obj)
+        for index, value in self._unique_keys(obj):
+            if index.get(value) == key:
+                del index[value]
+        if isinstance(obj, Post):
+            self.post_ids_by_user.get(obj.user_id, set()).discard(key)
+        elif isinstance(obj, Like):
+            self.like_counts[obj.post_id] -= 1
+            if not self.like_counts[obj.post_id]:
+                del self.like_counts[obj.post_id]
+            position = bisect_left(self.likes_by_time, (obj.created_at, key))
+            del self.likes_by_time[position]
+
+    def like_ids_between(self, start: datetime, end: datetime) -> list[int]:
+        """
+        Returns the ids of the likes created in [start, end), oldest first.
+        """
+        first = bisect_left(self.likes_by_time, (start,))
+        last = bisect_left(self.likes_by_time, (end,))
+        return [like_id for _, like_id in self.likes_by_time[first:last]]
+
+
+memory_store = MemoryStore()
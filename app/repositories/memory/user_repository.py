@@ -0,0 +1,104 @@
+import datetime
+
+from app.models import User
+from app.repositories.memory.base_repository import MemoryBaseRepository
+from app.repositories.memory.store import batches, day_number, row
+
+
+class MemoryUserRepository(MemoryBaseRepository):
+    model = User
+
+    def _new_user(self, new_user: dict) -> User:
+        user = self.model(**new_user)
+        user.created_at = datetime.datetime.utcnow()
+        if user.is_admin is None:
+            user.is_admin = False
+        return user
+
+    async def create_unique(self, new_user: dict):
+        user = self._new_user(new_user)
+        username_taken = new_user["username"] in self.store.users_by_username
+        email_taken = new_user["email"] in self.store.users_by_email
+        inserted = self.store.insert(user, on_conflict_do_nothing=True)
+        # As in SQL, the checks only report the rows that caused a conflict.
+        return row(
+            id=user.id if inserted else None,
+            username_taken=not inserted and username_taken,
+            email_taken=not inserted and email_taken,
+        )
+
+    async def bulk_create(self, new_users: list[dict]) -> int:
+        return sum(
+            self.store.insert(
+                self._new_user(new_user), on_conflict_do_nothing=True
+            )
+            for new_user in new_users
+        )
+
+    async def get_user_by_email(self, email: str):
+        return self.rows.get(self.store.users_by_email.get(email))
+
+    async def get_user_by_username(self, username: str):
+        return self.rows.get(self.store.users_by_username.get(username))
+
+    async def get_profile_by_username(self, username: str):
+        return await self.get_user_by_username(username)
+
+    async def exists_by_username(self, username: str) -> bool:
+        return username in self.store.users_by_username
+
+    async def exists_by_email(self, email: str) -> bool:
+        return email in self.store.users_by_email
+
+    async def get_last_login(self, user_id: int):
+        user = self.rows.get(user_id)
+        return user.last_login if user is not None else None
+
+    async def update_last_login(self, user: User):
+        stored = self.rows.get(user.id)
+        if stored is not None:
+            stored.last_login = datetime.datetime.utcnow()
+
+    async def get_user_by_id(self, user_id: int):
+        return self.rows.get(user_id)
+
+    async def update_last_request(self, user: User):
+        await self.update_last_request_many([user.id])
+
+    async def update_last_request_many(self, user_ids):
+        now = datetime.datetime.utcnow()
+        for user_id in user_ids:
+            stored = self.rows.get(user_id)
+            if stored is not None:
+                stored.last_request = now
+
+    async def get_last_request(self, user_id: int):
+        user = self.rows.get(user_id)
+        return user.last_request if user is not None else None
+
+    async def get_activity(self, user_id: int):
+        user = self.rows.get(user_id)
+        if user is None:
+            return None
+        return row(last_login=user.last_login, last_request=user.last_request)
+
+    async def stream_activities(self, user_ids: list[int]):
+        for user_id in user_ids:
+            user = self.rows.get(user_id)
+            if user is not None:
+                yield row(
+                    id=user.id,
+                    last_login=user.last_login,
+                    last_request=user.last_request,
+                )
+
+    async def stream_signup_days(
+        self, date_from, date_to, batch_size: int = 100_000
+    ):
+        signups = [
+            (user.id, day_number(user.created_at))
+            for user in self.rows.values()
+            if date_from <= user.created_at < date_to
+        ]
+        for rows in batches(signups, batch_size):
+            yield rows
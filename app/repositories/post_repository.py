@@ -1,24 +1,138 @@
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, func, tuple_
 
-from app.models import Post, User
+from app.models import Like, Post, User
+from app.core.like_archive import like_archive
+from app.core.shards import like_shards
 from app.repositories.base_repository import BaseRepository
+from app.repositories.archived_like_repository import track_live_from
+from app.repositories.sharded_like_repository import (
+    ShardedLikeRepository,
+    create_like_repository,
+)
+from app.utils.singleflight import singleflight
+
+# Built once, see like_repository.
+CACHED_POST_BY_ID = select(
+    Post.id, Post.title, Post.content, Post.created_at, Post.user_id
+).where(Post.id == bindparam("post_id"))
 
 
 class PostRepository(BaseRepository):
     model = Post
 
     async def get_posts_by_user_id(self, user_id: int):
-        query = self.model.__table__.select().where(
-            self.model.user_id == user_id
-        )
-        return await self.session.execute(query).scalars().all()
+        query = select(self.model).where(self.model.user_id == user_id)
+        response = await self.session.execute(query)
+        return response.scalars().all()
 
     async def get_user_by_id(self, user_id: int):
-        query = select(User).where(User.id == user_id)
-        response = await self.session.execute(query)
-        user = response.scalar()
-        return user
+        # Session.get answers from the session's identity map when the user
+        # was already loaded in this session and only queries otherwise.
+        return await self.session.get(User, user_id)
 
     async def get_post_by_id(self, post_id: int):
-        query = self.model.__table__.select().where(self.model.id == post_id)
-        return await self.get_one(query)
+        return await self.get_one_cached(
+            self.model.__tablename__,
+            post_id,
+            CACHED_POST_BY_ID,
+            {"post_id": post_id},
+        )
+
+    @singleflight.coalesce("post_like_counts")
+    async def get_like_counts(self, post_ids: list[int]) -> dict[int, int]:
+        if like_shards.enabled:
+            counts = await self._get_sharded_like_counts(post_ids)
+        else:
+            counts = await self.count_live_likes(post_ids)
+        if like_archive.enabled and counts:
+            await track_live_from(
+                like_archive,
+                create_like_repository(self.session, with_archive=False),
+            )
+            archived = like_archive.count_likes(list(counts))
+            for post_id, likes_count in archived.items():
+                counts[post_id] += likes_count
+        return counts
+
+    async def count_live_likes(self, post_ids: list[int]):
+        # Counts the likes in this session's database only, uncoalesced
+        # and without the shards or the archive. Joins through the
+        # relationship instead of loading Post.likes so that the whole
+        # batch is resolved by a single grouped query.
+        query = (
+            select(self.model.id, func.count(Like.id))
+            .outerjoin(self.model.likes)
+            .where(self.model.id.in_(post_ids))
+            .group_by(self.model.id)
+        )
+        response = await self.session.execute(query)
+        return {post_id: likes_count for post_id, likes_count in response}
+
+    async def search(
+        self,
+        text: str,
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ):
+        ts_query = func.websearch_to_tsquery("english", text)
+        rank = func.ts_rank(self.model.search_vector, ts_query).label("rank")
+        query = (
+            select(
+                self.model.id,
+                self.model.title,
+                self.model.content,
+                self.model.created_at,
+                rank,
+            )
+            .where(self.model.search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), self.model.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(rank, self.model.id) < tuple_(*after))
+        response = await self.session.execute(query)
+        return response.all()
+
+    async def stream_posts_in_date_range(
+        self, date_from, date_to, batch_size: int
+    ):
+        query = (
+            select(
+                self.model.id,
+                self.model.user_id,
+                self.model.title,
+                self.model.content,
+                self.model.created_at,
+            )
+            .where(
+                self.model.created_at >= date_from,
+                self.model.created_at < date_to,
+            )
+            .order_by(self.model.created_at)
+            .execution_options(yield_per=batch_size)
+        )
+        response = await self.session.stream(query)
+        async for rows in response.partitions():
+            yield rows
+
+    async def stream_post_ids(self, after_id: int, batch_size: int = 10_000):
+        query = (
+            select(self.model.id)
+            .where(self.model.id > after_id)
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        response = await self.session.stream_scalars(query)
+        async for post_ids in response.partitions():
+            yield post_ids
+
+    async def _get_sharded_like_counts(self, post_ids: list[int]):
+        query = select(self.model.id).where(self.model.id.in_(post_ids))
+        response = await self.session.execute(query)
+        existing_ids = response.scalars().all()
+        if not existing_ids:
+            return {}
+        counts = await ShardedLikeRepository(like_shards).count_likes(
+            existing_ids
+        )
+        return {post_id: counts.get(post_id, 0) for post_id in existing_ids}
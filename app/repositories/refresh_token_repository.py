@@ -0,0 +1,74 @@
+import datetime
+
+from sqlalchemy import insert, literal, select, update
+
+from app.models import RefreshToken, User
+from app.repositories.base_repository import BaseRepository
+
+
+class RefreshTokenRepository(BaseRepository):
+    model = RefreshToken
+
+    async def create_token(
+        self, user_id: int, token_hash: str, expires_at: datetime.datetime
+    ):
+        query = insert(self.model).values(
+            user_id=user_id, token_hash=token_hash, expires_at=expires_at
+        )
+        await self.session.execute(query)
+        await self.session.commit()
+
+    async def rotate(
+        self,
+        token_hash: str,
+        new_token_hash: str,
+        expires_at: datetime.datetime,
+    ):
+        # Revoking the old token, storing its replacement and reading the
+        # owner's username happen in one statement keyed by the token hash.
+        now = datetime.datetime.utcnow()
+        rotated = (
+            update(self.model)
+            .where(
+                self.model.token_hash == token_hash,
+                self.model.revoked_at.is_(None),
+                self.model.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(self.model.user_id)
+            .cte("rotated")
+        )
+        inserted = (
+            insert(self.model)
+            .from_select(
+                ["user_id", "token_hash", "created_at", "expires_at"],
+                select(
+                    rotated.c.user_id,
+                    literal(new_token_hash),
+                    literal(now),
+                    literal(expires_at),
+                ),
+            )
+            .returning(self.model.user_id)
+            .cte("inserted")
+        )
+        query = select(User.username).join(
+            inserted, inserted.c.user_id == User.id
+        )
+        response = await self.session.execute(query)
+        username = response.scalar()
+        await self.session.commit()
+        return username
+
+    async def revoke(self, token_hash: str) -> bool:
+        query = (
+            update(self.model)
+            .where(
+                self.model.token_hash == token_hash,
+                self.model.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.datetime.utcnow())
+        )
+        response = await self.session.execute(query)
+        await self.session.commit()
+        return response.rowcount > 0
@@ -0,0 +1,130 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.like_archive import like_archive
+from app.core.shards import LikeShards, like_shards
+from app.repositories.archived_like_repository import ArchivedLikeRepository
+from app.repositories.like_repository import LikeRepository
+
+
+class ShardedLikeRepository:
+    """
+    LikeRepository counterpart routing likes to shards by post id.
+
+    Single-post operations go to the shard of that post. Range reads run on
+    all shards concurrently, each with its own session and connection.
+    """
+
+    def __init__(self, shards: LikeShards):
+        self.shards = shards
+
+    async def _on_shard(self, shard: int, operation):
+        async with self.shards.session(shard) as session:
+            return await operation(LikeRepository(session))
+
+    async def _on_all_shards(self, operation) -> list:
+        return await asyncio.gather(
+            *(
+                self._on_shard(shard, operation)
+                for shard in range(len(self.shards))
+            )
+        )
+
+    async def _stream_all_shards(self, operation):
+        for shard in range(len(self.shards)):
+            async with self.shards.session(shard) as session:
+                async for rows in operation(LikeRepository(session)):
+                    yield rows
+
+    async def create_like(self, user_id: int, post_id: int):
+        return await self._on_shard(
+            self.shards.shard_of(post_id),
+            lambda repo: repo.create_like(user_id, post_id),
+        )
+
+    async def delete_like(self, user_id: int, post_id: int):
+        await self._on_shard(
+            self.shards.shard_of(post_id),
+            lambda repo: repo.delete_like(user_id, post_id),
+        )
+
+    async def get_like(self, user_id: int, post_id: int):
+        return await self._on_shard(
+            self.shards.shard_of(post_id),
+            lambda repo: repo.get_like(user_id, post_id),
+        )
+
+    async def get_likes_in_date_range_by_shard(self, date_from, date_to):
+        return await self._on_all_shards(
+            lambda repo: repo.get_likes_in_date_range(date_from, date_to)
+        )
+
+    async def get_likes_in_date_range(self, date_from, date_to):
+        by_shard = await self.get_likes_in_date_range_by_shard(
+            date_from, date_to
+        )
+        return [like for likes in by_shard for like in likes]
+
+    async def count_likes(self, post_ids: list[int]) -> dict[int, int]:
+        post_ids_by_shard: dict[int, list[int]] = {}
+        for post_id in post_ids:
+            shard = self.shards.shard_of(post_id)
+            post_ids_by_shard.setdefault(shard, []).append(post_id)
+
+        partial_counts = await asyncio.gather(
+            *(
+                self._on_shard(
+                    shard,
+                    lambda repo, ids=shard_post_ids: repo.count_likes(ids),
+                )
+                for shard, shard_post_ids in post_ids_by_shard.items()
+            )
+        )
+        counts = {}
+        for partial in partial_counts:
+            counts.update(partial)
+        return counts
+
+    async def get_first_like_time(self):
+        first_times = await self._on_all_shards(
+            lambda repo: repo.get_first_like_time()
+        )
+        return min(filter(None, first_times), default=None)
+
+    async def delete_likes_in_date_range(self, date_from, date_to):
+        await self._on_all_shards(
+            lambda repo: repo.delete_likes_in_date_range(date_from, date_to)
+        )
+
+    def stream_likes_in_date_range(self, date_from, date_to, batch_size: int):
+        return self._stream_all_shards(
+            lambda repo: repo.stream_likes_in_date_range(
+                date_from, date_to, batch_size
+            )
+        )
+
+    def stream_like_pairs(self, batch_size: int = 50_000):
+        return self._stream_all_shards(
+            lambda repo: repo.stream_like_pairs(batch_size)
+        )
+
+    def stream_like_days(self, date_from, date_to, batch_size: int = 100_000):
+        return self._stream_all_shards(
+            lambda repo: repo.stream_like_days(date_from, date_to, batch_size)
+        )
+
+
+def create_like_repository(session: AsyncSession, with_archive: bool = True):
+    """
+    Returns the like repository matching the configured storage mode.
+
+    Unless ``with_archive`` is False, reads also cover the archived likes.
+    """
+    if like_shards.enabled:
+        repo = ShardedLikeRepository(like_shards)
+    else:
+        repo = LikeRepository(session)
+    if with_archive and like_archive.enabled:
+        return ArchivedLikeRepository(repo, like_archive)
+    return repo
@@ -1,69 +1,192 @@
 from app.models import User
 import datetime
 from app.repositories.base_repository import BaseRepository
-from sqlalchemy import update
+from sqlalchemy import (
+    update,
+    select,
+    any_,
+    bindparam,
+    cast,
+    exists,
+    func,
+    Integer,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+# Built once, see like_repository.
+USER_BY_EMAIL = select(User.__table__).where(User.email == bindparam("email"))
+USER_BY_USERNAME = select(User.__table__).where(
+    User.username == bindparam("username")
+)
+# The mapped entity, which the request context remembers by its type.
+USER_PROFILE_BY_USERNAME = select(User).where(
+    User.username == bindparam("username")
+)
+USER_ID_BY_EMAIL = select(User.id).where(User.email == bindparam("email"))
+USER_ID_BY_USERNAME = select(User.id).where(
+    User.username == bindparam("username")
+)
+# Only stable columns are cached: the activity timestamps change on every
+# request and the password hash must not leave the database.
+CACHED_USER_BY_ID = select(
+    User.id,
+    User.username,
+    User.full_name,
+    User.email,
+    User.created_at,
+    User.is_admin,
+).where(User.id == bindparam("user_id"))
+LAST_LOGIN = select(User.last_login).where(User.id == bindparam("user_id"))
+LAST_REQUEST = select(User.last_request).where(User.id == bindparam("user_id"))
+ACTIVITY = select(User.last_login, User.last_request).where(
+    User.id == bindparam("user_id")
+)
+# Callers pass plain rows, so there are no session objects to synchronize.
+UPDATE_LAST_LOGIN = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(last_login=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
+UPDATE_LAST_REQUEST = (
+    update(User)
+    .where(User.id == bindparam("user_id"))
+    .values(last_request=bindparam("now"))
+    .execution_options(synchronize_session=False)
+)
 
 
 class UserRepository(BaseRepository):
     model = User
 
+    async def create_unique(self, new_user: dict):
+        # The outer SELECT runs on the snapshot taken before the INSERT, so
+        # the EXISTS checks only see rows that caused a conflict.
+        inserted = (
+            insert(self.model)
+            .values(**new_user)
+            .on_conflict_do_nothing()
+            .returning(self.model.id)
+            .cte("inserted")
+        )
+        query = select(
+            select(inserted.c.id).scalar_subquery().label("id"),
+            exists()
+            .where(self.model.username == new_user["username"])
+            .label("username_taken"),
+            exists()
+            .where(self.model.email == new_user["email"])
+            .label("email_taken"),
+        )
+        response = await self.session.execute(query)
+        await self.session.commit()
+        return response.one()
+
+    async def bulk_create(self, new_users: list[dict]) -> int:
+        query = (
+            insert(self.model)
+            .values(new_users)
+            .on_conflict_do_nothing()
+            .returning(self.model.id)
+        )
+        response = await self.session.execute(query)
+        await self.session.commit()
+        return len(response.all())
+
     async def get_user_by_email(self, email: str):
-        query = self.model.__table__.select().where(self.model.email == email)
-        return await self.get_one(query)
+        return await self.get_one(USER_BY_EMAIL, {"email": email})
 
     async def get_user_by_username(self, username: str):
-        query = self.model.__table__.select().where(
-            self.model.username == username
+        return await self.get_one(USER_BY_USERNAME, {"username": username})
+
+    async def get_profile_by_username(self, username: str):
+        response = await self.session.execute(
+            USER_PROFILE_BY_USERNAME, {"username": username}
         )
-        return await self.get_one(query)
+        return response.scalar_one_or_none()
 
     async def exists_by_username(self, username: str) -> bool:
-        query = self.model.__table__.select().where(
-            self.model.username == username
-        )
-        return await self.exists(query)
+        row = await self.get_one(USER_ID_BY_USERNAME, {"username": username})
+        return row is not None
 
     async def exists_by_email(self, email: str) -> bool:
-        query = self.model.__table__.select().where(self.model.email == email)
-        return await self.exists(query)
-
-    async def get_one(self, query):
-        response = await self.session.execute(query)
-        result = response.first()
-        return result
+        row = await self.get_one(USER_ID_BY_EMAIL, {"email": email})
+        return row is not None
 
     async def get_last_login(self, user_id: int):
-        query = self.model.__table__.select().where(self.model.id == user_id)
-        query = query.with_only_columns(self.model.last_login)
-        response = await self.session.execute(query)
+        response = await self.session.execute(LAST_LOGIN, {"user_id": user_id})
         result = response.scalar()
         return result
 
     async def update_last_login(self, user: User):
-        query = (
-            update(self.model)
-            .where(self.model.id == user.id)
-            .values(last_login=datetime.datetime.utcnow())
+        await self.session.execute(
+            UPDATE_LAST_LOGIN,
+            {"user_id": user.id, "now": datetime.datetime.utcnow()},
         )
-        await self.session.execute(query)
         await self.session.commit()
 
     async def get_user_by_id(self, user_id: int):
-        query = self.model.__table__.select().where(self.model.id == user_id)
-        return await self.get_one(query)
+        return await self.get_one_cached(
+            self.model.__tablename__,
+            user_id,
+            CACHED_USER_BY_ID,
+            {"user_id": user_id},
+        )
 
     async def update_last_request(self, user: User):
+        await self.session.execute(
+            UPDATE_LAST_REQUEST,
+            {"user_id": user.id, "now": datetime.datetime.utcnow()},
+        )
+        await self.session.commit()
+
+    async def update_last_request_many(self, user_ids):
         query = (
             update(self.model)
-            .where(self.model.id == user.id)
+            .where(self.model.id.in_(user_ids))
             .values(last_request=datetime.datetime.utcnow())
         )
         await self.session.execute(query)
         await self.session.commit()
 
     async def get_last_request(self, user_id: int):
-        query = self.model.__table__.select().where(self.model.id == user_id)
-        query = query.with_only_columns(self.model.last_request)
-        response = await self.session.execute(query)
+        response = await self.session.execute(
+            LAST_REQUEST, {"user_id": user_id}
+        )
         result = response.scalar()
         return result
+
+    async def get_activity(self, user_id: int):
+        return await self.get_one(ACTIVITY, {"user_id": user_id})
+
+    async def stream_activities(self, user_ids: list[int]):
+        # A single array parameter keeps the statement text identical for
+        # any number of ids, so the prepared statement is reused.
+        query = select(
+            self.model.id, self.model.last_login, self.model.last_request
+        ).where(
+            self.model.id
+            == any_(bindparam("user_ids", user_ids, type_=ARRAY(Integer)))
+        )
+        response = await self.session.stream(query)
+        async for row in response:
+            yield row
+
+    async def stream_signup_days(
+        self, date_from, date_to, batch_size: int = 100_000
+    ):
+        day = cast(
+            func.floor(func.extract("epoch", self.model.created_at) / 86400),
+            Integer,
+        )
+        query = (
+            select(self.model.id, day)
+            .where(
+                self.model.created_at >= date_from,
+                self.model.created_at < date_to,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        response = await self.session.stream(query)
+        async for rows in response.partitions():
+            yield rows
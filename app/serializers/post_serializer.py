@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -16,3 +18,26 @@ class PostResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class PostLikeCount(BaseModel):
+    post_id: int
+    likes_count: int
+
+
+class PostSearchResult(BaseModel):
+    id: int
+    title: str
+    content: str
+    created_at: datetime
+    rank: float
+
+
+class PostSearchPage(BaseModel):
+    items: list[PostSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class SimilarPost(BaseModel):
+    post_id: int
+    co_likes: int
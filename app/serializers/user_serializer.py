@@ -23,8 +23,9 @@ class UserResponse(BaseModel):
 
 
 class UserActivityResponse(BaseModel):
-    last_login: datetime
-    last_request: datetime
+    last_login: Optional[datetime.datetime] = None
+    last_request: Optional[datetime.datetime] = None
 
-    class Config:
-        arbitrary_types_allowed = True
+
+class UserActivity(UserActivityResponse):
+    id: int
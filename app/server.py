@@ -0,0 +1,39 @@
+"""
+Runs the application under uvicorn with a graceful shutdown.
+
+On SIGTERM or SIGINT the worker stops accepting requests and ends the like
+count streams right away, then gives in-flight requests up to
+SHUTDOWN_DRAIN_TIMEOUT seconds before cancelling them:
+    python -m app.server --host 0.0.0.0 --port 8000
+"""
+import argparse
+from types import FrameType
+
+import uvicorn
+
+from app.main import app, start_draining
+from config import SHUTDOWN_DRAIN_TIMEOUT
+
+
+class DrainingServer(uvicorn.Server):
+    def handle_exit(self, sig: int, frame: FrameType | None):
+        start_draining()
+        super().handle_exit(sig, frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    config = uvicorn.Config(
+        app,
+        host=args.host,
+        port=args.port,
+        timeout_graceful_shutdown=SHUTDOWN_DRAIN_TIMEOUT,
+    )
+    DrainingServer(config).run()
+
+
+if __name__ == "__main__":
+    main()
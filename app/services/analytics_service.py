@@ -0,0 +1,318 @@
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+from fastapi import HTTPException
+
+from app.repositories.daily_like_stats_repository import (
+    DailyLikeStatsRepository,
+)
+from app.repositories.like_repository import LikeRepository
+from app.repositories.user_repository import UserRepository
+from app.utils import activity_metrics
+from app.utils.hyperloglog import HyperLogLog, sketches_by_day
+from app.utils.invalidation import invalidation_bus
+from app.utils.singleflight import singleflight
+from app.utils.ttl_cache import TTLCache
+from config import ANALYTICS_EXACT_MAX_DAYS, HLL_PRECISION
+
+# Results for ranges that ended before today only change when a like of a
+# past day is removed, see invalidate_closed_periods.
+closed_period_cache = TTLCache(ttl=24 * 60 * 60, maxsize=256)
+CLOSED_PERIODS_NAMESPACE = "closed_periods"
+
+
+def _evict_closed_periods(day: date):
+    moment = datetime.combine(day, time.min)
+    # Keys are (metric, start, end, ...), see AnalyticsService.
+    closed_period_cache.delete_where(lambda key: key[1] <= moment < key[2])
+
+
+def invalidate_closed_periods(day: date):
+    """
+    Drops the cached results of every range covering ``day``, here and on
+    the other workers.
+    """
+    _evict_closed_periods(day)
+    invalidation_bus.publish(CLOSED_PERIODS_NAMESPACE, day.isoformat())
+
+
+async def _on_closed_periods_invalidated(namespace: str, days: list):
+    for day in days:
+        _evict_closed_periods(date.fromisoformat(day))
+
+
+invalidation_bus.subscribe(
+    _on_closed_periods_invalidated, {CLOSED_PERIODS_NAMESPACE}
+)
+
+
+async def _columns(batches) -> tuple[np.ndarray, np.ndarray]:
+    chunks = []
+    async for rows in batches:
+        if isinstance(rows, np.ndarray):
+            chunks.append(rows)
+            continue
+        chunks.append(
+            np.fromiter(
+                (value for row in rows for value in row),
+                dtype=np.int64,
+                count=2 * len(rows),
+            ).reshape(-1, 2)
+        )
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    pairs = np.concatenate(chunks)
+    return pairs[:, 0], pairs[:, 1]
+
+
+class AnalyticsService:
+    """
+    Service class for user activity analytics: active users and retention cohorts.
+
+    Likes and signups are read as integer columns and aggregated with numpy,
+    without building per-row Python objects. Results for ranges that have
+    already ended are cached, and concurrent identical requests share one
+    computation.
+
+    Attributes:
+        like_repo (LikeRepository): An instance of LikeRepository for database operations related to likes.
+        user_repo (UserRepository): An instance of UserRepository for user-related database operations.
+        stats_repo (DailyLikeStatsRepository): Stored per-day like counts and user sketches.
+    """
+
+    def __init__(
+        self,
+        like_repo: LikeRepository,
+        user_repo: UserRepository,
+        stats_repo: DailyLikeStatsRepository,
+    ):
+        self.like_repo = like_repo
+        self.user_repo = user_repo
+        self.stats_repo = stats_repo
+
+    @singleflight.coalesce("active_users")
+    async def get_active_users(self, date_from: str, date_to: str) -> dict:
+        """
+        Retrieves daily and weekly active users within a date range.
+
+        Args:
+            date_from (str): The start date in the format 'YYYY-MM-DD'.
+            date_to (str): The end date, inclusive, in the format 'YYYY-MM-DD'.
+
+        Returns:
+            dict: Distinct users who liked something, per day and per week.
+
+        Raises:
+            HTTPException: If the dates are invalid.
+        """
+        start, end = self._parse_range(date_from, date_to)
+        cache_key = ("active_users", start, end)
+        cached = closed_period_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user_ids, days = await _columns(
+            self.like_repo.stream_like_days(start, end)
+        )
+        result = activity_metrics.active_users(
+            user_ids,
+            days,
+            activity_metrics.day_number(start.date()),
+            activity_metrics.day_number(end.date()) - 1,
+        )
+        self._cache_if_closed(cache_key, end, result)
+        return result
+
+    @singleflight.coalesce("retention_cohorts")
+    async def get_retention_cohorts(
+        self, date_from: str, date_to: str
+    ) -> list[dict]:
+        """
+        Retrieves weekly retention of users who signed up within a date range.
+
+        Args:
+            date_from (str): The start date in the format 'YYYY-MM-DD'.
+            date_to (str): The end date, inclusive, in the format 'YYYY-MM-DD'.
+
+        Returns:
+            list[dict]: One cohort per signup week with its size and the share of
+            its users who liked something in each following week.
+
+        Raises:
+            HTTPException: If the dates are invalid.
+        """
+        start, end = self._parse_range(date_from, date_to)
+        cache_key = ("retention", start, end)
+        cached = closed_period_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        signup_user_ids, signup_days = await _columns(
+            self.user_repo.stream_signup_days(start, end)
+        )
+        like_user_ids, like_days = await _columns(
+            self.like_repo.stream_like_days(start, end)
+        )
+        result = activity_metrics.retention_cohorts(
+            signup_user_ids,
+            signup_days,
+            like_user_ids,
+            like_days,
+            activity_metrics.day_number(start.date()),
+            activity_metrics.day_number(end.date()) - 1,
+        )
+        self._cache_if_closed(cache_key, end, result)
+        return result
+
+    @singleflight.coalesce("unique_users")
+    async def get_unique_users(
+        self, date_from: str, date_to: str, exact: bool = False
+    ) -> dict:
+        """
+        Counts the likes and the distinct users who liked something within a date range.
+
+        Ranges of up to ANALYTICS_EXACT_MAX_DAYS days, or any range when
+        ``exact`` is set, are counted exactly from the likes. Longer ranges
+        merge the stored HyperLogLog sketches of each day, whose estimates
+        have the returned relative standard error.
+
+        Args:
+            date_from (str): The start date in the format 'YYYY-MM-DD'.
+            date_to (str): The end date, inclusive, in the format 'YYYY-MM-DD'.
+            exact (bool): Whether to count exactly regardless of the range length.
+
+        Returns:
+            dict: The number of likes and of distinct users, whether the user
+            count is exact and its relative standard error.
+
+        Raises:
+            HTTPException: If the dates are invalid.
+        """
+        start, end = self._parse_range(date_from, date_to)
+        exact = exact or (end - start).days <= ANALYTICS_EXACT_MAX_DAYS
+        cache_key = ("unique_users", start, end, exact)
+        cached = closed_period_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if exact:
+            user_ids, _ = await _columns(
+                self.like_repo.stream_like_days(start, end)
+            )
+            likes_count = len(user_ids)
+            users_count = len(np.unique(user_ids))
+            relative_error = 0.0
+        else:
+            likes_count, sketch = await self._range_sketch(start, end)
+            users_count = sketch.count()
+            relative_error = HyperLogLog.relative_error(HLL_PRECISION)
+
+        result = {
+            "date_from": start.date(),
+            "date_to": (end - timedelta(days=1)).date(),
+            "likes_count": likes_count,
+            "users_count": users_count,
+            "exact": exact,
+            "relative_error": round(relative_error, 4),
+        }
+        self._cache_if_closed(cache_key, end, result)
+        return result
+
+    async def _range_sketch(self, start: datetime, end: datetime):
+        """
+        Merges the per-day sketches of a range, building the missing ones.
+
+        Sketches of days that have ended are stored; the current day is
+        sketched from its likes on every call.
+        """
+        today = datetime.utcnow().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        closed_end = max(start, min(end, today))
+        sketch = HyperLogLog(HLL_PRECISION)
+        likes_count = 0
+
+        stored = {
+            row.day: row
+            for row in await self.stats_repo.get_days(
+                start.date(), closed_end.date()
+            )
+            if not row.likes_count
+            or len(row.users_sketch) == 1 << HLL_PRECISION
+        }
+        for row in stored.values():
+            likes_count += row.likes_count
+            if row.likes_count:
+                sketch.merge(HyperLogLog.from_bytes(row.users_sketch))
+
+        missing = [
+            start + timedelta(days=offset)
+            for offset in range((closed_end - start).days)
+            if (start + timedelta(days=offset)).date() not in stored
+        ]
+        if missing:
+            rows = await self._build_days(
+                missing[0], missing[-1] + timedelta(days=1), set(missing)
+            )
+            await self.stats_repo.save_days(rows)
+            for row in rows:
+                likes_count += row["likes_count"]
+                if row["likes_count"]:
+                    sketch.merge(HyperLogLog.from_bytes(row["users_sketch"]))
+
+        if closed_end < end:
+            user_ids, _ = await _columns(
+                self.like_repo.stream_like_days(closed_end, end)
+            )
+            likes_count += len(user_ids)
+            sketch.add_many(user_ids)
+        return likes_count, sketch
+
+    async def _build_days(
+        self, start: datetime, end: datetime, wanted: set[datetime]
+    ) -> list[dict]:
+        user_ids, days = await _columns(
+            self.like_repo.stream_like_days(start, end)
+        )
+        sketches = sketches_by_day(user_ids, days, HLL_PRECISION)
+        like_days, likes_per_day = np.unique(days, return_counts=True)
+        # Distinct (day, user) keys give the exact users of each day.
+        user_days = np.unique(days * (1 << 32) + user_ids) >> 32
+        active_days, users_per_day = np.unique(user_days, return_counts=True)
+        likes_count = dict(zip(like_days.tolist(), likes_per_day.tolist()))
+        users_count = dict(zip(active_days.tolist(), users_per_day.tolist()))
+
+        rows = []
+        for day in sorted(wanted):
+            number = activity_metrics.day_number(day.date())
+            sketch = sketches.get(number)
+            rows.append(
+                {
+                    "day": day.date(),
+                    "likes_count": likes_count.get(number, 0),
+                    "users_count": users_count.get(number, 0),
+                    "users_sketch": sketch.to_bytes() if sketch else b"",
+                }
+            )
+        return rows
+
+    @staticmethod
+    def _parse_range(date_from: str, date_to: str):
+        try:
+            start = datetime.strptime(date_from, "%Y-%m-%d")
+            end = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Dates must be in the format YYYY-MM-DD",
+            )
+        if end <= start:
+            raise HTTPException(
+                status_code=400, detail="date_to must not be before date_from"
+            )
+        return start, end
+
+    @staticmethod
+    def _cache_if_closed(cache_key, end: datetime, result):
+        if end <= datetime.utcnow():
+            closed_period_cache.set(cache_key, result)
@@ -0,0 +1,27 @@
+from app.utils.dependencies.repositories import open_repositories
+from app.utils.job_queue import job_queue
+
+LAST_REQUEST_JOB = "last_request"
+DAILY_STATS_INVALIDATION_JOB = "daily_stats_invalidation"
+
+
+async def update_last_requests(user_ids: list[int]):
+    async with open_repositories() as repos:
+        await repos.users.update_last_request_many(set(user_ids))
+
+
+def enqueue_last_request(user_id: int):
+    job_queue.enqueue(LAST_REQUEST_JOB, user_id)
+
+
+async def invalidate_daily_stats(days: list):
+    async with open_repositories() as repos:
+        await repos.daily_like_stats.delete_days(set(days))
+
+
+def enqueue_daily_stats_invalidation(day):
+    job_queue.enqueue(DAILY_STATS_INVALIDATION_JOB, day)
+
+
+job_queue.register(LAST_REQUEST_JOB, update_last_requests)
+job_queue.register(DAILY_STATS_INVALIDATION_JOB, invalidate_daily_stats)
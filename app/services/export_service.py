@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from app.repositories.like_repository import LikeRepository
+from app.repositories.post_repository import PostRepository
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+# Columns of the rows streamed for each entity, in order; also the CSV
+# header, which is written even when the range holds no rows.
+EXPORT_COLUMNS = {
+    "likes": ("id", "user_id", "post_id", "is_liked", "created_at"),
+    "posts": ("id", "user_id", "title", "content", "created_at"),
+}
+
+
+class ExportService:
+    """
+    Service class for exporting raw likes and posts for a date range.
+
+    Rows are read through a server-side cursor in batches and encoded batch by
+    batch, so memory use does not depend on the size of the range.
+
+    Attributes:
+        like_repo (LikeRepository): An instance of LikeRepository for database operations related to likes.
+        post_repo (PostRepository): An instance of PostRepository for database operations related to posts.
+    """
+
+    def __init__(self, like_repo: LikeRepository, post_repo: PostRepository):
+        self.like_repo = like_repo
+        self.post_repo = post_repo
+
+    def export(
+        self, entity: str, date_from: str, date_to: str, export_format: str
+    ):
+        """
+        Builds a generator of encoded chunks for the requested export.
+
+        Args:
+            entity (str): Either 'likes' or 'posts'.
+            date_from (str): The start date in the format 'YYYY-MM-DD'.
+            date_to (str): The end date, inclusive, in the format 'YYYY-MM-DD'.
+            export_format (str): Either 'csv' or 'ndjson'.
+
+        Returns:
+            AsyncIterator[str]: The encoded export, one chunk per batch of rows.
+
+        Raises:
+            HTTPException: If the entity, format or dates are invalid.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail="Unknown format")
+        try:
+            date_from = datetime.strptime(date_from, "%Y-%m-%d")
+            date_to = datetime.strptime(date_to, "%Y-%m-%d") + timedelta(
+                days=1
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail="Dates must be in the format YYYY-MM-DD",
+            )
+
+        if entity == "likes":
+            batches = self.like_repo.stream_likes_in_date_range(
+                date_from, date_to, EXPORT_BATCH_SIZE
+            )
+        elif entity == "posts":
+            batches = self.post_repo.stream_posts_in_date_range(
+                date_from, date_to, EXPORT_BATCH_SIZE
+            )
+        else:
+            raise HTTPException(status_code=404, detail="Unknown export")
+
+        if export_format == "csv":
+            return self._encode_csv(batches, EXPORT_COLUMNS[entity])
+        return self._encode_ndjson(batches)
+
+    @staticmethod
+    def _csv_rows(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @classmethod
+    async def _encode_csv(cls, batches, columns: tuple[str, ...]):
+        yield cls._csv_rows([columns])
+        async for rows in batches:
+            yield cls._csv_rows(rows)
+
+    @staticmethod
+    async def _encode_ndjson(batches):
+        async for rows in batches:
+            yield "".join(
+                json.dumps(row._asdict(), default=datetime.isoformat) + "\n"
+                for row in rows
+            )
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.core.database import async_session, engine
+from app.core.like_archive import (
+    COLUMNS,
+    like_archive,
+    next_month,
+    to_microseconds,
+)
+from app.repositories.sharded_like_repository import create_like_repository
+from app.utils.invalidation import invalidation_bus
+from config import (
+    LIKE_ARCHIVE_AFTER_DAYS,
+    LIKE_ARCHIVE_INTERVAL_SECONDS,
+    LIKE_ARCHIVE_REFRESH_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 50_000
+# Only one process at a time may move likes, whatever the number of workers.
+ARCHIVE_LOCK_ID = 0x6C696B65
+LIKE_ARCHIVE_NAMESPACE = "like_archive"
+
+
+async def _read_month(repo, start: datetime, end: datetime) -> dict:
+    chunks = {name: [] for name in COLUMNS}
+    async for rows in repo.stream_likes_in_date_range(
+        start, end, ARCHIVE_BATCH_SIZE
+    ):
+        count = len(rows)
+        chunks["id"].append(np.fromiter((r.id for r in rows), np.int64, count))
+        chunks["user_id"].append(
+            np.fromiter((r.user_id for r in rows), np.int64, count)
+        )
+        chunks["post_id"].append(
+            np.fromiter((r.post_id for r in rows), np.int64, count)
+        )
+        chunks["is_liked"].append(
+            np.fromiter((bool(r.is_liked) for r in rows), np.bool_, count)
+        )
+        chunks["created_at"].append(
+            np.fromiter(
+                (to_microseconds(r.created_at) for r in rows), np.int64, count
+            )
+        )
+    return {
+        name: np.concatenate(values) if values else np.empty(0, dtype)
+        for (name, values), dtype in zip(chunks.items(), COLUMNS.values())
+    }
+
+
+async def archive_closed_months(now: datetime | None = None) -> list:
+    """
+    Moves the likes of every month that ended LIKE_ARCHIVE_AFTER_DAYS ago
+    from the database to the archive.
+
+    A month is written to the archive as pending and announced, its rows
+    are deleted and only then is it published. Readers count a pending
+    month once its rows are gone from every shard, see
+    ArchivedLikeRepository. A pending month is complete, since it was read
+    before any of its rows were deleted, so it is never written again: the
+    deletes on the shards are separate transactions, and a run that failed
+    halfway through them leaves only part of the month live. Until the
+    next run deletes the rest, the likes of the shards already deleted are
+    missing from reads, so failed runs are retried after
+    LIKE_ARCHIVE_REFRESH_SECONDS.
+
+    Returns:
+        list[date]: The months published by this run.
+    """
+    if not like_archive.enabled:
+        return []
+    cutoff = (now or datetime.utcnow()) - timedelta(
+        days=LIKE_ARCHIVE_AFTER_DAYS
+    )
+    written = []
+
+    async with engine.connect() as lock_conn:
+        locked = await lock_conn.scalar(
+            select(func.pg_try_advisory_lock(ARCHIVE_LOCK_ID))
+        )
+        if not locked:
+            return written
+        try:
+            like_archive.refresh()
+            async with async_session() as session:
+                repo = create_like_repository(session, with_archive=False)
+                first_like_time = await repo.get_first_like_time()
+                like_archive.set_live_from(first_like_time)
+                # Pending months before the oldest live like lost their
+                # rows in a run that failed before publishing them.
+                for month in sorted(like_archive.pending):
+                    if month < like_archive.live_from:
+                        like_archive.publish_month(month)
+                        written.append(month)
+                if first_like_time is None:
+                    return written
+
+                month = like_archive.live_from
+                while next_month(month) <= cutoff.date():
+                    start = datetime.combine(month, time.min)
+                    end = datetime.combine(next_month(month), time.min)
+                    published = month in like_archive.months
+                    if not published and month not in like_archive.pending:
+                        columns = await _read_month(repo, start, end)
+                        await asyncio.to_thread(
+                            like_archive.write_month, month, columns
+                        )
+                        invalidation_bus.publish(
+                            LIKE_ARCHIVE_NAMESPACE, month.strftime("%Y-%m")
+                        )
+                        await invalidation_bus.flush()
+                    await repo.delete_likes_in_date_range(start, end)
+                    if not published:
+                        like_archive.publish_month(month)
+                        written.append(month)
+                    month = next_month(month)
+        finally:
+            await lock_conn.scalar(
+                select(func.pg_advisory_unlock(ARCHIVE_LOCK_ID))
+            )
+            for month in written:
+                invalidation_bus.publish(
+                    LIKE_ARCHIVE_NAMESPACE, month.strftime("%Y-%m")
+                )
+    return written
+
+
+async def _refresh_archive(namespace: str, months: list):
+    await asyncio.to_thread(like_archive.refresh)
+
+
+invalidation_bus.subscribe(_refresh_archive, {LIKE_ARCHIVE_NAMESPACE})
+
+
+async def refresh_archive_periodically():
+    if not like_archive.enabled:
+        return
+    while True:
+        await asyncio.sleep(LIKE_ARCHIVE_REFRESH_SECONDS)
+        try:
+            await asyncio.to_thread(like_archive.refresh)
+        except Exception:
+            logger.exception("Refreshing the like archive failed")
+
+
+async def archive_likes_periodically():
+    while True:
+        delay = LIKE_ARCHIVE_INTERVAL_SECONDS
+        try:
+            months = await archive_closed_months()
+            if months:
+                logger.info("Archived the likes of %s", months)
+        except Exception:
+            logger.exception("Archiving likes failed")
+            # A month deleted from only some shards is missing from reads
+            # until a run finishes it, so retry soon.
+            delay = min(delay, LIKE_ARCHIVE_REFRESH_SECONDS)
+        await asyncio.sleep(delay)
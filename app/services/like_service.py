@@ -1,9 +1,22 @@
 from fastapi import HTTPException
 from datetime import datetime
 
+from app.core.like_archive import ArchivedLike
+from app.models import User
 from app.repositories.like_repository import LikeRepository
 from app.repositories.post_repository import PostRepository
 from app.repositories.user_repository import UserRepository
+from app.services.analytics_service import invalidate_closed_periods
+from app.services.background_jobs import (
+    enqueue_daily_stats_invalidation,
+    enqueue_last_request,
+)
+from app.services.like_stream import like_count_broadcaster
+from app.services.post_filter import post_id_filter
+from app.services.recommendation_service import recommendation_engine
+from app.utils.dependencies.request_context import RequestContext
+from app.utils.singleflight import singleflight
+from app.services.post_service import like_counts_cache
 
 
 class LikeService:
@@ -17,6 +30,7 @@ class LikeService:
         like_repo (LikeRepository): An instance of LikeRepository for database operations related to likes.
         user_repo (UserRepository): An instance of UserRepository for user-related database operations.
         post_repo (PostRepository): An instance of PostRepository for post-related database operations.
+        context (RequestContext): The entities already loaded while handling the current request.
     """
 
     def __init__(
@@ -24,10 +38,12 @@ class LikeService:
         like_repo: LikeRepository,
         user_repo: UserRepository,
         post_repo: PostRepository,
+        context: RequestContext | None = None,
     ):
         self.like_repo = like_repo
         self.user_repo = user_repo
         self.post_repo = post_repo
+        self.context = context or RequestContext()
 
     async def add_like(self, user_id: int, post_id: int):
         """
@@ -43,7 +59,14 @@ class LikeService:
         Raises:
             HTTPException: If the user or post does not exist.
         """
-        user = await self.user_repo.get_user_by_id(user_id)
+        if not post_id_filter.might_exist(post_id):
+            raise HTTPException(
+                status_code=400, detail="There is no such post"
+            )
+
+        user = self.context.get(User, user_id)
+        if user is None:
+            user = await self.user_repo.get_user_by_id(user_id)
         post = await self.post_repo.get_post_by_id(post_id)
 
         if not user or not post:
@@ -59,8 +82,14 @@ class LikeService:
             )
 
         like = await self.like_repo.create_like(user_id, post_id)
-        # Update last request for user
-        await self.user_repo.update_last_request(user)
+        if like is None:
+            raise HTTPException(
+                status_code=400, detail="You have already liked this post"
+            )
+        like_counts_cache.delete(post_id)
+        recommendation_engine.record_like(user_id, post_id)
+        like_count_broadcaster.mark_changed(post_id)
+        enqueue_last_request(user_id)
 
         return like
 
@@ -76,16 +105,26 @@ class LikeService:
             bool: True if the like is successfully removed.
 
         Raises:
-            HTTPException: If the like does not exist.
+            HTTPException: If the like does not exist or has been archived.
         """
         existing_like = await self.like_repo.get_like(user_id, post_id)
 
+        if existing_like and isinstance(existing_like[0], ArchivedLike):
+            raise HTTPException(
+                status_code=400, detail="Archived likes cannot be removed"
+            )
         if existing_like:
             await self.like_repo.delete_like(user_id, post_id)
-
-            # Update last request for user
-            user = await self.user_repo.get_user_by_id(user_id)
-            await self.user_repo.update_last_request(user)
+            like_counts_cache.delete(post_id)
+            recommendation_engine.record_unlike(user_id, post_id)
+            like_count_broadcaster.mark_changed(post_id)
+            enqueue_last_request(user_id)
+            # Stored sketches of past days cannot forget a user, and cached
+            # results of closed ranges still count the like.
+            like_date = existing_like[0].created_at.date()
+            if like_date < datetime.utcnow().date():
+                enqueue_daily_stats_invalidation(like_date)
+                invalidate_closed_periods(like_date)
 
             return True
         else:
@@ -93,6 +132,7 @@ class LikeService:
                 status_code=400, detail="You did not like this post"
             )
 
+    @singleflight.coalesce("likes_analytics")
     async def get_likes_analytics(self, date_from: str, date_to: str):
         """
         Retrieves analytics data for likes within a specified date range.
@@ -110,12 +150,34 @@ class LikeService:
         date_from = datetime.strptime(date_from, "%Y-%m-%d")
         date_to = datetime.strptime(date_to, "%Y-%m-%d")
 
-        analytics = {}
-
-        likes = await self.like_repo.get_likes_in_date_range(
+        likes_by_shard = await self.like_repo.get_likes_in_date_range_by_shard(
             date_from, date_to
         )
 
+        analytics = {}
+        for partial in map(self._aggregate_likes, likes_by_shard):
+            for like_date, data in partial.items():
+                if like_date not in analytics:
+                    analytics[like_date] = data
+                    continue
+                merged = analytics[like_date]
+                merged["likes_count"] += data["likes_count"]
+                merged["users_count"] |= data["users_count"]
+                merged["likes_list"] += data["likes_list"]
+
+        for date, data in analytics.items():
+            data["users_count"] = len(data["users_count"])
+        if not analytics:
+            return "There are currently no likes."
+        return analytics
+
+    @staticmethod
+    def _aggregate_likes(likes) -> dict:
+        """
+        Groups the likes of one shard by day, keeping the users as a set so
+        that partial results from several shards can be merged.
+        """
+        analytics = {}
         for like in likes:
             like_date = like.created_at.date()
             if like_date not in analytics:
@@ -136,9 +198,4 @@ class LikeService:
                     "created_at": like.created_at,
                 }
             )
-
-        for date, data in analytics.items():
-            data["users_count"] = len(data["users_count"])
-        if not analytics:
-            return "There are currently no likes."
         return analytics
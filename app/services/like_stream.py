@@ -0,0 +1,138 @@
+import asyncio
+import logging
+
+from app.repositories.like_repository import LIKE_COUNTS_NAMESPACE
+from app.services.post_service import like_counts_cache
+from app.utils.dependencies.repositories import open_repositories
+from app.utils.invalidation import invalidation_bus
+from config import LIKE_STREAM_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+class LikeCountSubscriber:
+    """
+    One client connection following the like counts of a set of posts.
+
+    Only the latest count of each post is kept until the client reads it, so
+    memory per connection is bounded by the number of followed posts.
+
+    Attributes:
+        post_ids (list[int]): The posts the client follows.
+    """
+
+    def __init__(self, post_ids: list[int]):
+        self.post_ids = post_ids
+        self.pending: dict[int, int] = {}
+        self.ready = asyncio.Event()
+
+    def offer(self, post_id: int, likes_count: int):
+        self.pending[post_id] = likes_count
+        self.ready.set()
+
+    def take(self) -> dict[int, int]:
+        pending, self.pending = self.pending, {}
+        self.ready.clear()
+        return pending
+
+
+class LikeCountBroadcaster:
+    """
+    Coalesces like changes and fans fresh counts out to subscribers.
+
+    Like services only mark posts as changed. Once per ``interval`` a single
+    producer reads the current counts of changed posts that have subscribers
+    with one grouped query and offers them to every subscriber of each post.
+
+    Attributes:
+        interval (float): Seconds between two rounds of updates.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._subscribers: dict[int, set[LikeCountSubscriber]] = {}
+        self._changed: set[int] = set()
+        self.closed = False
+        self.connections = 0
+        self.rounds = 0
+        self.updates_sent = 0
+
+    def mark_changed(self, post_id: int):
+        if post_id in self._subscribers:
+            self._changed.add(post_id)
+
+    def subscribe(self, post_ids: list[int]) -> LikeCountSubscriber:
+        subscriber = LikeCountSubscriber(post_ids)
+        for post_id in post_ids:
+            self._subscribers.setdefault(post_id, set()).add(subscriber)
+        # The next round sends the current counts to the new subscriber.
+        self._changed.update(post_ids)
+        self.connections += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: LikeCountSubscriber):
+        for post_id in subscriber.post_ids:
+            subscribers = self._subscribers.get(post_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[post_id]
+        self.connections -= 1
+
+    def close(self):
+        """
+        Wakes every subscriber so that open streams end, for example on shutdown.
+        """
+        self.closed = True
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                subscriber.ready.set()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.publish_changes()
+            except Exception:
+                logger.exception("Publishing like counts failed")
+
+    async def publish_changes(self):
+        changed = [
+            post_id
+            for post_id in self._changed
+            if post_id in self._subscribers
+        ]
+        self._changed = set()
+        if not changed:
+            return
+
+        async with open_repositories() as repos:
+            counts = await repos.posts.get_like_counts(changed)
+        like_counts_cache.set_many(counts)
+
+        self.rounds += 1
+        for post_id, likes_count in counts.items():
+            for subscriber in self._subscribers.get(post_id, ()):
+                subscriber.offer(post_id, likes_count)
+                self.updates_sent += 1
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "followed_posts": len(self._subscribers),
+            "pending_posts": len(self._changed),
+            "rounds": self.rounds,
+            "updates_sent": self.updates_sent,
+        }
+
+
+like_count_broadcaster = LikeCountBroadcaster(LIKE_STREAM_INTERVAL)
+
+
+async def _mark_like_counts_changed(namespace: str, post_ids: list[int]):
+    # Clients streaming from this worker follow likes made on the others.
+    for post_id in post_ids:
+        like_count_broadcaster.mark_changed(post_id)
+
+
+invalidation_bus.subscribe(_mark_like_counts_changed, {LIKE_COUNTS_NAMESPACE})
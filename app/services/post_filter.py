@@ -0,0 +1,47 @@
+import asyncio
+import logging
+
+from app.models import Post
+from app.utils.dependencies.repositories import open_repositories
+from app.utils.id_bitmap import IdBitmap
+from app.utils.invalidation import invalidation_bus
+from config import POST_FILTER_REFRESH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Transactions still open during a load may commit ids below the new
+# watermark, so every refresh re-reads this many ids below it.
+REFRESH_OVERLAP = 1000
+
+post_id_filter = IdBitmap()
+
+
+async def load_post_ids():
+    """
+    Adds the ids of posts created since the last load to the filter.
+    """
+    after_id = max(post_id_filter.watermark - REFRESH_OVERLAP, 0)
+    async with open_repositories() as repos:
+        async for post_ids in repos.posts.stream_post_ids(after_id):
+            post_id_filter.add_many(post_ids)
+            post_id_filter.watermark = max(
+                post_id_filter.watermark, post_ids[-1]
+            )
+
+
+async def _add_published_post_ids(namespace: str, post_ids: list[int]):
+    # Posts created on other workers are accepted before the next refresh.
+    # Deleted ids are added too, which the filter tolerates.
+    post_id_filter.add_many(post_ids)
+
+
+invalidation_bus.subscribe(_add_published_post_ids, {Post.__tablename__})
+
+
+async def refresh_post_ids_periodically():
+    while True:
+        await asyncio.sleep(POST_FILTER_REFRESH_SECONDS)
+        try:
+            await load_post_ids()
+        except Exception:
+            logger.exception("Refreshing the post id filter failed")
@@ -1,26 +1,59 @@
 from fastapi import HTTPException
 
-from app.models import Post
+from app.models import Post, User
+from app.repositories.like_repository import LIKE_COUNTS_NAMESPACE
 from app.repositories.post_repository import PostRepository
 from app.repositories.user_repository import UserRepository
-from app.serializers.post_serializer import PostCreate, PostResponse
+from app.services.background_jobs import enqueue_last_request
+from app.services.post_filter import post_id_filter
+from app.serializers.post_serializer import (
+    PostCreate,
+    PostResponse,
+    PostLikeCount,
+    PostSearchPage,
+    PostSearchResult,
+)
+from app.utils.dependencies.request_context import RequestContext
+from app.utils.invalidation import invalidation_bus
+from app.utils.ttl_cache import TTLCache
+
+MAX_LIKE_COUNT_IDS = 500
+
+# Like counts of hot posts are served from memory for a few seconds.
+like_counts_cache = TTLCache(ttl=5)
+
+
+async def _evict_like_counts(namespace: str, post_ids: list[int]):
+    for post_id in post_ids:
+        like_counts_cache.delete(post_id)
+
+
+invalidation_bus.subscribe(_evict_like_counts, {LIKE_COUNTS_NAMESPACE})
 
 
 class PostService:
     """
-    Service class for handling post-related operations including creation.
+    Service class for handling post-related operations including creation, search and like counts.
 
     This class provides methods to create new posts, associating them with the specified user,
-    and updating the last request time for the user.
+    updating the last request time for the user, searching posts by their text and resolving
+    like counts for many posts at once.
 
     Attributes:
         post_repo (PostRepository): An instance of PostRepository for database operations related to posts.
         user_repo (UserRepository): An instance of UserRepository for user-related database operations.
+        context (RequestContext): The entities already loaded while handling the current request.
     """
 
-    def __init__(self, post_repo: PostRepository, user_repo: UserRepository):
+    def __init__(
+        self,
+        post_repo: PostRepository,
+        user_repo: UserRepository,
+        context: RequestContext | None = None,
+    ):
         self.post_repo = post_repo
         self.user_repo = user_repo
+        self.context = context or RequestContext()
 
     async def create_post(self, post_data: PostCreate, user_id: int):
         """
@@ -36,7 +69,9 @@ class PostService:
         Raises:
             HTTPException: If the user specified by user_id is not found.
         """
-        user = await self.post_repo.get_user_by_id(user_id)
+        user = self.context.get(User, user_id)
+        if user is None:
+            user = await self.post_repo.get_user_by_id(user_id)
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -45,8 +80,9 @@ class PostService:
         post_data_dict["user_id"] = user_id
         new_post = Post(**post_data_dict)
         await self.post_repo.save(new_post)
+        post_id_filter.add(new_post.id)
 
-        await self.user_repo.update_last_request(user)
+        enqueue_last_request(user_id)
 
         return PostResponse(
             id=new_post.id,
@@ -54,3 +90,70 @@ class PostService:
             content=new_post.content,
             author=user.username,
         )
+
+    async def get_like_counts(
+        self, post_ids: list[int]
+    ) -> list[PostLikeCount]:
+        """
+        Retrieves like counts for a batch of posts.
+
+        Counts found in the short-lived cache are returned as is, the rest are
+        resolved with a single grouped query. Ids of nonexistent posts are skipped.
+
+        Args:
+            post_ids (list[int]): The distinct IDs of the posts.
+
+        Returns:
+            list[PostLikeCount]: Like counts in the order of the requested IDs.
+        """
+        counts = like_counts_cache.get_many(post_ids)
+        missing_ids = [
+            post_id for post_id in post_ids if post_id not in counts
+        ]
+        if missing_ids:
+            fetched = await self.post_repo.get_like_counts(missing_ids)
+            like_counts_cache.set_many(fetched)
+            counts.update(fetched)
+
+        return [
+            PostLikeCount(post_id=post_id, likes_count=counts[post_id])
+            for post_id in post_ids
+            if post_id in counts
+        ]
+
+    async def search_posts(
+        self, text: str, limit: int, cursor: str | None = None
+    ) -> PostSearchPage:
+        """
+        Searches posts by title and content, best matches first.
+
+        Results are paginated by keyset: the cursor of a page encodes the rank
+        and ID of its last post, and the next page starts right after it.
+
+        Args:
+            text (str): The search query, in web search syntax.
+            limit (int): The maximum number of posts on the page.
+            cursor (str, optional): The next_cursor of the previous page.
+
+        Returns:
+            PostSearchPage: The found posts and the cursor of the next page.
+
+        Raises:
+            HTTPException: If the cursor is malformed.
+        """
+        after = None
+        if cursor:
+            try:
+                rank, post_id = cursor.split("_")
+                after = (float(rank), int(post_id))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        rows = await self.post_repo.search(text, limit, after)
+        items = [PostSearchResult(**row._mapping) for row in rows]
+
+        next_cursor = None
+        if len(items) == limit:
+            last = items[-1]
+            next_cursor = f"{last.rank!r}_{last.id}"
+        return PostSearchPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,243 @@
+import asyncio
+import logging
+
+import numpy as np
+
+from app.utils.dependencies.repositories import open_repositories
+from app.utils.ttl_cache import TTLCache
+from config import RECOMMENDATIONS_REBUILD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class LikeMatrix:
+    """
+    Immutable user x post like matrix stored in CSR and CSC form.
+
+    Users and posts are mapped to dense indices. ``user_indptr``/``user_posts``
+    hold the sorted post indices liked by each user, ``post_indptr``/``post_users``
+    the user indices who liked each post.
+    """
+
+    def __init__(self, user_ids: np.ndarray, post_ids: np.ndarray):
+        self.user_ids, user_codes = np.unique(user_ids, return_inverse=True)
+        self.post_ids, post_codes = np.unique(post_ids, return_inverse=True)
+        self.user_index = {
+            int(user_id): index for index, user_id in enumerate(self.user_ids)
+        }
+        self.post_index = {
+            int(post_id): index for index, post_id in enumerate(self.post_ids)
+        }
+
+        self.user_indptr, self.user_posts = self._compress(
+            user_codes, post_codes, len(self.user_ids)
+        )
+        self.post_indptr, self.post_users = self._compress(
+            post_codes, user_codes, len(self.post_ids)
+        )
+
+    @staticmethod
+    def _compress(rows: np.ndarray, columns: np.ndarray, size: int):
+        order = np.lexsort((columns, rows))
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+        return indptr, columns[order].astype(np.int32)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.user_posts)
+
+    def posts_of(self, user_index: int) -> np.ndarray:
+        return self.user_posts[
+            self.user_indptr[user_index] : self.user_indptr[user_index + 1]
+        ]
+
+    def users_of(self, post_index: int) -> np.ndarray:
+        return self.post_users[
+            self.post_indptr[post_index] : self.post_indptr[post_index + 1]
+        ]
+
+    def contains(self, user_id: int, post_id: int) -> bool:
+        user_index = self.user_index.get(user_id)
+        post_index = self.post_index.get(post_id)
+        if user_index is None or post_index is None:
+            return False
+        posts = self.posts_of(user_index)
+        position = np.searchsorted(posts, post_index)
+        return position < len(posts) and posts[position] == post_index
+
+    def memory_bytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in (
+                self.user_ids,
+                self.post_ids,
+                self.user_indptr,
+                self.user_posts,
+                self.post_indptr,
+                self.post_users,
+            )
+        )
+
+
+class RecommendationEngine:
+    """
+    In-memory "users who liked this also liked" recommendations.
+
+    A full rebuild loads all likes into a LikeMatrix. Likes added or removed
+    afterwards are kept as a small delta and merged into every computation
+    until the next rebuild. The co-occurrence of a post with all others is
+    computed on demand with one bincount over the posts of its likers, and
+    the resulting top posts are cached for a short time.
+    """
+
+    def __init__(self, cache_ttl: float = 60):
+        self.matrix = LikeMatrix(
+            np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        )
+        self.added: dict[int, set[int]] = {}
+        self.removed: set[tuple[int, int]] = set()
+        self._similar_cache = TTLCache(ttl=cache_ttl)
+
+    def record_like(self, user_id: int, post_id: int):
+        if (user_id, post_id) in self.removed:
+            self.removed.discard((user_id, post_id))
+        elif not self.matrix.contains(user_id, post_id):
+            self.added.setdefault(post_id, set()).add(user_id)
+
+    def record_unlike(self, user_id: int, post_id: int):
+        likers = self.added.get(post_id)
+        if likers and user_id in likers:
+            likers.discard(user_id)
+        elif self.matrix.contains(user_id, post_id):
+            self.removed.add((user_id, post_id))
+
+    async def rebuild(self):
+        # Changes recorded while the likes are being read are already part
+        # of the snapshot or will be deduplicated against it by contains().
+        added, removed = self.added, self.removed
+        self.added, self.removed = {}, set()
+        try:
+            user_ids, post_ids = await self._load_likes()
+            matrix = await asyncio.to_thread(LikeMatrix, user_ids, post_ids)
+        except BaseException:
+            for post_id, likers in added.items():
+                self.added.setdefault(post_id, set()).update(likers)
+            self.removed |= removed
+            raise
+
+        self.matrix = matrix
+        self.added = {
+            post_id: {u for u in likers if not matrix.contains(u, post_id)}
+            for post_id, likers in self.added.items()
+        }
+        self.removed = {
+            pair for pair in self.removed if matrix.contains(*pair)
+        }
+        self._similar_cache.clear()
+
+    @staticmethod
+    async def _load_likes():
+        user_chunks, post_chunks = [], []
+        async with open_repositories() as repos:
+            async for rows in repos.likes.stream_like_pairs():
+                if isinstance(rows, np.ndarray):
+                    pairs = rows
+                else:
+                    pairs = np.fromiter(
+                        (value for row in rows for value in row),
+                        dtype=np.int64,
+                        count=2 * len(rows),
+                    ).reshape(-1, 2)
+                user_chunks.append(pairs[:, 0])
+                post_chunks.append(pairs[:, 1])
+        if not user_chunks:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(user_chunks), np.concatenate(post_chunks)
+
+    def similar(self, post_id: int, limit: int) -> list[tuple[int, int]]:
+        """
+        Returns up to ``limit`` (post_id, co_likes) pairs, most co-liked first.
+        """
+        cached = self._similar_cache.get((post_id, limit))
+        if cached is not None:
+            return cached
+
+        matrix = self.matrix
+        likers = set(self.added.get(post_id, ()))
+        post_index = matrix.post_index.get(post_id)
+        if post_index is not None:
+            likers.update(
+                int(matrix.user_ids[user_index])
+                for user_index in matrix.users_of(post_index)
+                if (int(matrix.user_ids[user_index]), post_id)
+                not in self.removed
+            )
+
+        user_indices = [
+            matrix.user_index[user_id]
+            for user_id in likers
+            if user_id in matrix.user_index
+        ]
+        if user_indices:
+            liked_posts = np.concatenate(
+                [matrix.posts_of(user_index) for user_index in user_indices]
+            )
+            base_counts = np.bincount(
+                liked_posts, minlength=len(matrix.post_ids)
+            )
+        else:
+            base_counts = np.zeros(len(matrix.post_ids), dtype=np.int64)
+
+        counts: dict[int, int] = {}
+        for user_id, other_id in self.removed:
+            other_index = matrix.post_index[other_id]
+            if user_id in likers and base_counts[other_index]:
+                base_counts[other_index] -= 1
+        for other_id, other_likers in self.added.items():
+            common = len(other_likers & likers)
+            if not common:
+                continue
+            other_index = matrix.post_index.get(other_id)
+            if other_index is not None:
+                base_counts[other_index] += common
+            else:
+                counts[other_id] = common
+
+        if post_index is not None:
+            base_counts[post_index] = 0
+        top = min(limit, np.count_nonzero(base_counts))
+        if top:
+            candidates = np.argpartition(-base_counts, top - 1)[:top]
+            counts.update(
+                (int(matrix.post_ids[index]), int(base_counts[index]))
+                for index in candidates
+            )
+        counts.pop(post_id, None)
+
+        result = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        result = result[:limit]
+        self._similar_cache.set((post_id, limit), result)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self.matrix.user_ids),
+            "posts": len(self.matrix.post_ids),
+            "likes": self.matrix.nnz,
+            "memory_bytes": self.matrix.memory_bytes(),
+            "pending_added": sum(len(users) for users in self.added.values()),
+            "pending_removed": len(self.removed),
+        }
+
+
+recommendation_engine = RecommendationEngine()
+
+
+async def rebuild_recommendations_periodically():
+    while True:
+        try:
+            await recommendation_engine.rebuild()
+        except Exception:
+            logger.exception("Rebuilding the recommendations failed")
+        await asyncio.sleep(RECOMMENDATIONS_REBUILD_SECONDS)
@@ -0,0 +1,102 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable
+
+from app.core.database import async_session
+from app.repositories.user_repository import UserRepository
+from app.serializers.user_serializer import UserCreate
+from config import password_context
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [password_context.hash(password) for password in passwords]
+
+
+def _batches(users: Iterable[UserCreate], batch_size: int):
+    users = iter(users)
+    while batch := list(islice(users, batch_size)):
+        yield batch
+
+
+class UserImporter:
+    """
+    Imports users in bulk, hashing passwords in parallel across processes.
+
+    Passwords of the next batch are hashed while the current batch is being
+    inserted. Users whose username or email already exist are skipped.
+
+    Attributes:
+        batch_size (int): The number of users inserted per statement.
+        processes (int): The number of worker processes used for hashing.
+    """
+
+    def __init__(self, batch_size: int = 1000, processes: int | None = None):
+        self.batch_size = batch_size
+        self.processes = processes or os.cpu_count() or 1
+
+    async def import_users(self, users: Iterable[UserCreate]) -> dict:
+        """
+        Imports the given users.
+
+        Args:
+            users (Iterable[UserCreate]): The users to import.
+
+        Returns:
+            dict: The number of imported and skipped users.
+        """
+        imported = skipped = 0
+        batches = _batches(users, self.batch_size)
+
+        with ProcessPoolExecutor(self.processes) as executor:
+            batch = next(batches, None)
+            hashing = self._hash(executor, batch) if batch else None
+
+            while batch:
+                hashed_passwords = await hashing
+                next_batch = next(batches, None)
+                if next_batch:
+                    hashing = asyncio.ensure_future(
+                        self._hash(executor, next_batch)
+                    )
+
+                inserted = await self._insert(batch, hashed_passwords)
+                imported += inserted
+                skipped += len(batch) - inserted
+                batch = next_batch
+
+        return {"imported": imported, "skipped": skipped}
+
+    async def _hash(
+        self, executor: ProcessPoolExecutor, batch: list[UserCreate]
+    ) -> list[str]:
+        loop = asyncio.get_running_loop()
+        chunk_size = -(-len(batch) // self.processes)
+        passwords = [user.password for user in batch]
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    hash_passwords,
+                    passwords[start : start + chunk_size],
+                )
+                for start in range(0, len(passwords), chunk_size)
+            )
+        )
+        return [hashed for chunk in chunks for hashed in chunk]
+
+    async def _insert(
+        self, batch: list[UserCreate], hashed_passwords: list[str]
+    ) -> int:
+        new_users = [
+            {
+                "username": user.username,
+                "full_name": user.full_name,
+                "email": user.email,
+                "hashed_password": hashed_password,
+            }
+            for user, hashed_password in zip(batch, hashed_passwords)
+        ]
+        async with async_session() as session:
+            return await UserRepository(session).bulk_create(new_users)
@@ -1,9 +1,25 @@
+import datetime
+
 from fastapi import HTTPException
-from app.auth.security import verify_password, create_jwt_token
-from app.models.user_model import User
+from app.auth.security import (
+    verify_password,
+    create_jwt_token,
+    create_refresh_token,
+    hash_refresh_token,
+)
+from app.auth.token_serializer import Token
+from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.repositories.user_repository import UserRepository
-from app.serializers.user_serializer import UserCreate, UserResponse
-from config import password_context
+from app.services.background_jobs import enqueue_last_request
+from app.serializers.user_serializer import (
+    UserCreate,
+    UserResponse,
+    UserActivity,
+    UserActivityResponse,
+)
+from config import password_context, REFRESH_TOKEN_EXPIRE_DAYS
+
+MAX_ACTIVITY_IDS = 1000
 
 
 class UserService:
@@ -11,19 +27,27 @@ class UserService:
     Service class for user-related operations including registration, login, and information retrieval.
 
     This class provides methods to register new users, authenticate users during login,
-    and retrieve last login and last request timestamps for users.
+    refresh and revoke their tokens, and retrieve last login and last request timestamps
+    for one or many users.
 
     Attributes:
         user_repo (UserRepository): An instance of UserRepository for database operations related to users.
+        token_repo (RefreshTokenRepository): An instance of RefreshTokenRepository for refresh token operations.
     """
 
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self, user_repo: UserRepository, token_repo: RefreshTokenRepository
+    ):
         self.user_repo = user_repo
+        self.token_repo = token_repo
 
     async def register_user(self, user_data: UserCreate) -> UserResponse:
         """
         Registers a new user with the provided data.
 
+        The username and email uniqueness is enforced by the database in the same
+        statement that inserts the user.
+
         Args:
             user_data (UserCreate): The data for creating the new user.
 
@@ -33,46 +57,43 @@ class UserService:
         Raises:
             HTTPException: If a user with the same username or email already exists.
         """
-        if await self.user_repo.exists_by_username(user_data.username):
-            raise HTTPException(
-                detail="User with this username already exists",
-                status_code=400,
-            )
-
-        if await self.user_repo.exists_by_email(user_data.email):
-            raise HTTPException(
-                detail="User with this email already exists",
-                status_code=400,
-            )
-
         hashed_password = password_context.hash(user_data.password)
 
-        new_user = User(
-            username=user_data.username,
-            full_name=user_data.full_name,
-            email=user_data.email,
-            hashed_password=hashed_password,
+        result = await self.user_repo.create_unique(
+            {
+                "username": user_data.username,
+                "full_name": user_data.full_name,
+                "email": user_data.email,
+                "hashed_password": hashed_password,
+            }
         )
 
-        await self.user_repo.save(new_user)
+        if result.id is None:
+            if result.username_taken:
+                detail = "User with this username already exists"
+            elif result.email_taken:
+                detail = "User with this email already exists"
+            else:
+                detail = "User with this username or email already exists"
+            raise HTTPException(detail=detail, status_code=400)
 
         return UserResponse(
-            id=new_user.id,
-            username=new_user.username,
-            full_name=new_user.full_name,
-            email=new_user.email,
+            id=result.id,
+            username=user_data.username,
+            full_name=user_data.full_name,
+            email=user_data.email,
         )
 
-    async def login_user(self, username: str, password: str) -> str:
+    async def login_user(self, username: str, password: str) -> Token:
         """
-        Authenticates a user during login and generates an access token.
+        Authenticates a user during login and generates an access and a refresh token.
 
         Args:
             username (str): The username of the user trying to log in.
             password (str): The password provided by the user.
 
         Returns:
-            str: The JWT access token if login is successful.
+            Token: The JWT access token and the refresh token if login is successful.
 
         Raises:
             HTTPException: If the username or password is incorrect.
@@ -87,10 +108,72 @@ class UserService:
             )
 
         await self.user_repo.update_last_login(user)
-        await self.user_repo.update_last_request(user)
+        enqueue_last_request(user.id)
+
+        refresh_token, refresh_token_hash = create_refresh_token()
+        await self.token_repo.create_token(
+            user.id, refresh_token_hash, self._refresh_token_expiry()
+        )
 
         access_token = await create_jwt_token({"sub": user.username})
-        return access_token
+        return Token(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+        )
+
+    async def refresh_access_token(self, refresh_token: str) -> Token:
+        """
+        Exchanges a refresh token for a new access token and a new refresh token.
+
+        The presented refresh token is revoked, so each one can be used only once.
+        No password verification is involved.
+
+        Args:
+            refresh_token (str): The refresh token issued at login or by the previous refresh.
+
+        Returns:
+            Token: The new JWT access token and refresh token.
+
+        Raises:
+            HTTPException: If the refresh token is unknown, expired or already used.
+        """
+        new_refresh_token, new_refresh_token_hash = create_refresh_token()
+        username = await self.token_repo.rotate(
+            hash_refresh_token(refresh_token),
+            new_refresh_token_hash,
+            self._refresh_token_expiry(),
+        )
+        if username is None:
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid refresh token",
+            )
+
+        access_token = await create_jwt_token({"sub": username})
+        return Token(
+            access_token=access_token,
+            refresh_token=new_refresh_token,
+            token_type="bearer",
+        )
+
+    async def revoke_refresh_token(self, refresh_token: str) -> bool:
+        """
+        Revokes a refresh token, for example on logout.
+
+        Args:
+            refresh_token (str): The refresh token to revoke.
+
+        Returns:
+            bool: True if an active token was revoked.
+        """
+        return await self.token_repo.revoke(hash_refresh_token(refresh_token))
+
+    @staticmethod
+    def _refresh_token_expiry() -> datetime.datetime:
+        return datetime.datetime.utcnow() + datetime.timedelta(
+            days=REFRESH_TOKEN_EXPIRE_DAYS
+        )
 
     async def get_last_login(self, user_id: int):
         """
@@ -123,3 +206,43 @@ class UserService:
         """
         last_request = await self.user_repo.get_last_request(user_id)
         return last_request
+
+    async def get_activity(self, user_id: int) -> UserActivityResponse:
+        """
+        Retrieves the last login and last request timestamps of a user in one query.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            UserActivityResponse: The last login and last request timestamps.
+
+        Raises:
+            HTTPException: If the user specified by user_id is not found.
+        """
+        activity = await self.user_repo.get_activity(user_id)
+        if activity is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return UserActivityResponse(
+            last_login=activity.last_login,
+            last_request=activity.last_request,
+        )
+
+    async def stream_activities(self, user_ids: list[int]):
+        """
+        Yields the activity of many users, resolved with a single query.
+
+        Unknown user IDs are skipped.
+
+        Args:
+            user_ids (list[int]): The IDs of the users.
+
+        Yields:
+            UserActivity: The activity of each found user.
+        """
+        async for row in self.user_repo.stream_activities(user_ids):
+            yield UserActivity(
+                id=row.id,
+                last_login=row.last_login,
+                last_request=row.last_request,
+            )
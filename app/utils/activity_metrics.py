@@ -0,0 +1,153 @@
+"""
+Vectorised activity metrics over columnar like data.
+
+Days are integers counted from 1970-01-01 and weeks start on Monday, so that
+``week_of(day)`` is the number of the week containing the day.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+EPOCH = date(1970, 1, 1)
+
+
+def day_number(value: date) -> int:
+    return (value - EPOCH).days
+
+
+def day_date(day: int) -> date:
+    return EPOCH + timedelta(days=int(day))
+
+
+def week_of(days: np.ndarray) -> np.ndarray:
+    # 1970-01-01 was a Thursday, shifting by three days aligns weeks on Monday.
+    return (days + 3) // 7
+
+
+def week_start(week: int) -> date:
+    return day_date(week * 7 - 3)
+
+
+def _unique_pairs(
+    user_ids: np.ndarray, periods: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the distinct (user, period) pairs as two aligned arrays.
+    """
+    if len(user_ids) == 0:
+        return user_ids, periods
+    min_period = periods.min()
+    span = np.int64(periods.max() - min_period + 1)
+    keys = np.unique(user_ids.astype(np.int64) * span + (periods - min_period))
+    return keys // span, keys % span + min_period
+
+
+def active_users(
+    user_ids: np.ndarray, days: np.ndarray, first_day: int, last_day: int
+) -> dict:
+    """
+    Counts distinct active users per day and per week.
+
+    Args:
+        user_ids (np.ndarray): The user of each like.
+        days (np.ndarray): The day of each like.
+        first_day (int): The first day of the range.
+        last_day (int): The last day of the range, inclusive.
+
+    Returns:
+        dict: ``daily`` counts for every day and ``weekly`` counts for every
+        week overlapping the range.
+    """
+    in_range = (days >= first_day) & (days <= last_day)
+    user_ids, days = user_ids[in_range], days[in_range]
+
+    _, active_days = _unique_pairs(user_ids, days)
+    daily = np.bincount(
+        active_days - first_day, minlength=last_day - first_day + 1
+    )
+
+    first_week, last_week = week_of(first_day), week_of(last_day)
+    _, active_weeks = _unique_pairs(user_ids, week_of(days))
+    weekly = np.bincount(
+        active_weeks - first_week, minlength=last_week - first_week + 1
+    )
+
+    return {
+        "daily": [
+            {"date": day_date(first_day + offset), "active_users": int(count)}
+            for offset, count in enumerate(daily)
+        ],
+        "weekly": [
+            {
+                "week_start": week_start(first_week + offset),
+                "active_users": int(count),
+            }
+            for offset, count in enumerate(weekly)
+        ],
+    }
+
+
+def retention_cohorts(
+    signup_user_ids: np.ndarray,
+    signup_days: np.ndarray,
+    like_user_ids: np.ndarray,
+    like_days: np.ndarray,
+    first_day: int,
+    last_day: int,
+) -> list[dict]:
+    """
+    Builds the weekly retention matrix of users who signed up within the range.
+
+    Row i is the cohort of users who signed up in the i-th week of the range,
+    column j counts how many of them liked something j weeks after signing up.
+
+    Args:
+        signup_user_ids (np.ndarray): The id of each user.
+        signup_days (np.ndarray): The signup day of each user.
+        like_user_ids (np.ndarray): The user of each like.
+        like_days (np.ndarray): The day of each like.
+        first_day (int): The first day of the range.
+        last_day (int): The last day of the range, inclusive.
+
+    Returns:
+        list[dict]: One entry per cohort with its size, active user counts and
+        retention rates per week since signup.
+    """
+    first_week, last_week = week_of(first_day), week_of(last_day)
+    weeks = last_week - first_week + 1
+
+    in_range = (signup_days >= first_day) & (signup_days <= last_day)
+    cohort_users = signup_user_ids[in_range]
+    cohort_of_user = week_of(signup_days[in_range]) - first_week
+    order = np.argsort(cohort_users)
+    cohort_users, cohort_of_user = cohort_users[order], cohort_of_user[order]
+    sizes = np.bincount(cohort_of_user, minlength=weeks)
+
+    active = np.zeros((weeks, weeks), dtype=np.int64)
+    in_range = (like_days >= first_day) & (like_days <= last_day)
+    users, activity_weeks = _unique_pairs(
+        like_user_ids[in_range], week_of(like_days[in_range])
+    )
+    if len(users) and len(cohort_users):
+        positions = np.searchsorted(cohort_users, users)
+        positions = np.minimum(positions, len(cohort_users) - 1)
+        known = cohort_users[positions] == users
+        cohorts = cohort_of_user[positions[known]]
+        offsets = activity_weeks[known] - first_week - cohorts
+        valid = offsets >= 0
+        active = np.bincount(
+            cohorts[valid] * weeks + offsets[valid], minlength=weeks * weeks
+        ).reshape(weeks, weeks)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where(sizes[:, None] > 0, active / sizes[:, None], 0.0)
+
+    return [
+        {
+            "week_start": week_start(first_week + cohort),
+            "users": int(sizes[cohort]),
+            "active": active[cohort, : weeks - cohort].tolist(),
+            "retention": np.round(rates[cohort, : weeks - cohort], 4).tolist(),
+        }
+        for cohort in range(weeks)
+    ]
@@ -0,0 +1,132 @@
+import asyncio
+import math
+
+from fastapi.responses import JSONResponse
+
+from config import ADMISSION_LIMITS
+
+
+class AdmissionGate:
+    """
+    Limits how many requests of one route group run at the same time.
+
+    Requests beyond the concurrency limit wait in a bounded queue. A request is
+    rejected right away when the queue is full, or after waiting longer than
+    the admission timeout.
+
+    Attributes:
+        prefix (str): The path prefix the gate applies to.
+        max_concurrency (int): The number of requests allowed to run at once.
+        max_queue (int): The number of requests allowed to wait for a slot.
+        timeout (float): The longest time in seconds a request may wait.
+    """
+
+    def __init__(
+        self, prefix: str, max_concurrency: int, max_queue: int, timeout: float
+    ):
+        self.prefix = prefix
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.timeout))
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionController:
+    """
+    Maps request paths to admission gates by their longest matching prefix.
+    """
+
+    def __init__(self, limits: dict[str, dict]):
+        self.gates = [
+            AdmissionGate(prefix, **limit) for prefix, limit in limits.items()
+        ]
+        self.gates.sort(key=lambda gate: len(gate.prefix), reverse=True)
+
+    def match(self, path: str) -> AdmissionGate | None:
+        for gate in self.gates:
+            if path.startswith(gate.prefix):
+                return gate
+        return None
+
+    def stats(self) -> dict:
+        return {gate.prefix: gate.stats() for gate in self.gates}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware answering 503 with Retry-After when a route group is saturated.
+
+    The slot is held until the response is fully sent, so streaming
+    responses count against the limit for their whole duration.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.controller.match(scope["path"])
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await gate.acquire():
+            response = JSONResponse(
+                {"detail": "Server is busy, try again later"},
+                status_code=503,
+                headers={"Retry-After": str(gate.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+
+admission_controller = AdmissionController(ADMISSION_LIMITS)
@@ -0,0 +1,291 @@
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlparse
+
+from app.utils.invalidation import invalidation_bus
+from app.utils.singleflight import SingleFlight, singleflight
+from config import (
+    CACHE_BACKEND,
+    CACHE_MAX_ENTRIES,
+    CACHE_NEGATIVE_TTL,
+    CACHE_TTL,
+    REDIS_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a key-value store holding encoded cache entries.
+
+    Attributes:
+        shared (bool): Whether all workers see the same entries.
+    """
+
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str):
+        ...
+
+    async def close(self):
+        pass
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process backend evicting the least recently used entries first.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in memory.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol (RESP) over a single connection.
+
+    Only GET, SET with expiry and DEL are used, so any server implementing
+    them works. Connection errors are logged and treated as cache misses.
+
+    Attributes:
+        url (str): The server address, for example redis://localhost:6379/0.
+    """
+
+    shared = True
+
+    def __init__(self, url: str):
+        self.url = url
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._call(b"GET", key.encode())
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self._call(
+            b"SET", key.encode(), value, b"PX", str(int(ttl * 1000)).encode()
+        )
+
+    async def delete(self, key: str):
+        await self._call(b"DEL", key.encode())
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def _connect(self):
+        url = urlparse(self.url)
+        self._reader, self._writer = await asyncio.open_connection(
+            url.hostname or "localhost", url.port or 6379
+        )
+        if url.password:
+            await self._send(b"AUTH", url.password.encode())
+        database = url.path.lstrip("/")
+        if database:
+            await self._send(b"SELECT", database.encode())
+
+    async def _call(self, *args: bytes):
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await self._send(*args)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                logger.exception("Redis cache backend is unavailable")
+                await self.close()
+                return None
+
+    async def _send(self, *args: bytes):
+        command = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            command.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._writer.write(b"".join(command))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self):
+        line = (await self._reader.readuntil(b"\r\n"))[:-2]
+        kind, payload = line[:1], line[1:]
+        if kind == b"+":
+            return payload
+        if kind == b"-":
+            raise ConnectionError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if kind == b"*":
+            return [await self._read_reply() for _ in range(int(payload))]
+        raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+
+def _encode_value(value: Any):
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _decode_value(value: dict):
+    if "$datetime" in value:
+        return datetime.fromisoformat(value["$datetime"])
+    return value
+
+
+class ReadThroughCache:
+    """
+    Read-through cache of JSON-serializable lookups on top of a backend.
+
+    Missing entities are cached as well, with a shorter TTL. Concurrent misses
+    on the same key share a single load instead of all hitting the database.
+    A load that an invalidation of its key overtakes may have read the old
+    row, so its result is returned but not stored. Only invalidations made
+    through this instance are seen: with a shared backend, which receives no
+    invalidations from the bus, a load running on another worker while the
+    row changes can still store the old row, and it is then served until
+    its TTL expires.
+
+    Attributes:
+        backend (CacheBackend): Where the encoded entries are stored.
+        ttl (float): Lifetime of a cached entity in seconds.
+        negative_ttl (float): Lifetime of a cached miss in seconds.
+        flight (SingleFlight): Coalesces concurrent loads of the same key.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl: float,
+        negative_ttl: float,
+        flight: SingleFlight | None = None,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.flight = flight or SingleFlight()
+        # Invalidations received by each key while it is being loaded.
+        self._loading: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale_loads = 0
+
+    @staticmethod
+    def key(namespace: str, obj_id: Any) -> str:
+        return f"{namespace}:{obj_id}"
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        obj_id: Any,
+        load: Callable[[], Awaitable[dict | None]],
+    ) -> dict | None:
+        key = self.key(namespace, obj_id)
+        encoded = await self.backend.get(key)
+        if encoded is not None:
+            self.hits += 1
+            return json.loads(encoded, object_hook=_decode_value)["value"]
+
+        self.misses += 1
+
+        async def load_and_store():
+            self._loading[key] = 0
+            try:
+                value = await load()
+                if self._loading[key]:
+                    self.stale_loads += 1
+                    return value
+                await self.backend.set(
+                    key,
+                    json.dumps(
+                        {"value": value}, default=_encode_value
+                    ).encode(),
+                    self.ttl if value is not None else self.negative_ttl,
+                )
+                return value
+            finally:
+                del self._loading[key]
+
+        return await self.flight.do(
+            f"cache:{namespace}", obj_id, load_and_store
+        )
+
+    async def invalidate(self, namespace: str, obj_id: Any):
+        key = self.key(namespace, obj_id)
+        if key in self._loading:
+            self._loading[key] += 1
+        await self.backend.delete(key)
+
+    async def invalidate_many(self, namespace: str, obj_ids: list):
+        for obj_id in obj_ids:
+            await self.invalidate(namespace, obj_id)
+
+    async def close(self):
+        await self.backend.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_loads": self.stale_loads,
+        }
+
+
+def create_cache_backend() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL)
+    return LRUCacheBackend(CACHE_MAX_ENTRIES)
+
+
+entity_cache = ReadThroughCache(
+    create_cache_backend(),
+    ttl=CACHE_TTL,
+    negative_ttl=CACHE_NEGATIVE_TTL,
+    flight=singleflight,
+)
+if not entity_cache.backend.shared:
+    invalidation_bus.subscribe(entity_cache.invalidate_many)
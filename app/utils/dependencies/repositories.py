@@ -0,0 +1,87 @@
+from contextlib import asynccontextmanager
+
+from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.repositories.daily_like_stats_repository import (
+    DailyLikeStatsRepository,
+)
+from app.repositories.memory.daily_like_stats_repository import (
+    MemoryDailyLikeStatsRepository,
+)
+from app.repositories.memory.like_repository import MemoryLikeRepository
+from app.repositories.memory.post_repository import MemoryPostRepository
+from app.repositories.memory.refresh_token_repository import (
+    MemoryRefreshTokenRepository,
+)
+from app.repositories.memory.store import MemoryStore, memory_store
+from app.repositories.memory.user_repository import MemoryUserRepository
+from app.repositories.post_repository import PostRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.sharded_like_repository import create_like_repository
+from app.repositories.user_repository import UserRepository
+from app.utils.dependencies.get_session import get_session
+from config import REPOSITORY_BACKEND
+
+
+class Repositories:
+    """
+    The repositories of one unit of work, all on the same backend.
+
+    Attributes:
+        users (UserRepository): Users.
+        posts (PostRepository): Posts.
+        likes (LikeRepository): Likes, including shards and the archive when enabled.
+        refresh_tokens (RefreshTokenRepository): Refresh tokens.
+        daily_like_stats (DailyLikeStatsRepository): Stored per-day like statistics.
+    """
+
+    def __init__(self, users, posts, likes, refresh_tokens, daily_like_stats):
+        self.users = users
+        self.posts = posts
+        self.likes = likes
+        self.refresh_tokens = refresh_tokens
+        self.daily_like_stats = daily_like_stats
+
+
+def sqlalchemy_repositories(session: AsyncSession) -> Repositories:
+    return Repositories(
+        users=UserRepository(session),
+        posts=PostRepository(session),
+        likes=create_like_repository(session),
+        refresh_tokens=RefreshTokenRepository(session),
+        daily_like_stats=DailyLikeStatsRepository(session),
+    )
+
+
+def memory_repositories(store: MemoryStore = memory_store) -> Repositories:
+    return Repositories(
+        users=MemoryUserRepository(store),
+        posts=MemoryPostRepository(store),
+        likes=MemoryLikeRepository(store),
+        refresh_tokens=MemoryRefreshTokenRepository(store),
+        daily_like_stats=MemoryDailyLikeStatsRepository(store),
+    )
+
+
+def get_repositories(
+    session: AsyncSession = Depends(get_session),
+) -> Repositories:
+    # The session is only opened once a query runs, so the memory backend
+    # never connects to the database.
+    if REPOSITORY_BACKEND == "memory":
+        return memory_repositories()
+    return sqlalchemy_repositories(session)
+
+
+@asynccontextmanager
+async def open_repositories():
+    """
+    Opens the configured repositories for work outside of a request.
+    """
+    if REPOSITORY_BACKEND == "memory":
+        yield memory_repositories()
+        return
+    async with async_session() as session:
+        yield sqlalchemy_repositories(session)
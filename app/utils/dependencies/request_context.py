@@ -0,0 +1,27 @@
+from typing import Any
+
+
+class RequestContext:
+    """
+    Identity map of the entities already loaded while handling one request.
+
+    FastAPI caches dependencies per request, so every dependant asking for
+    the context of a request gets the same instance.
+
+    Attributes:
+        current_user (User | None): The authenticated user, once resolved.
+    """
+
+    def __init__(self):
+        self.current_user = None
+        self._entities: dict[tuple[type, Any], Any] = {}
+
+    def remember(self, obj: Any):
+        self._entities[(type(obj), obj.id)] = obj
+
+    def get(self, model: type, obj_id: Any):
+        return self._entities.get((model, obj_id))
+
+
+def get_request_context() -> RequestContext:
+    return RequestContext()
@@ -1,40 +1,64 @@
 from fastapi.params import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.like_repository import LikeRepository
-from app.repositories.post_repository import PostRepository
-from app.repositories.user_repository import UserRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService
 from app.services.like_service import LikeService
 from app.services.post_service import PostService
 from app.services.user_service import UserService
-from app.utils.dependencies.get_session import get_session
+from app.utils.dependencies.repositories import (
+    Repositories,
+    get_repositories,
+)
+from app.utils.dependencies.request_context import (
+    RequestContext,
+    get_request_context,
+)
 
 
 def get_user_service(
-    session: AsyncSession = Depends(get_session),
+    repos: Repositories = Depends(get_repositories),
 ) -> UserService:
-    repo = UserRepository(session)
-    service = UserService(user_repo=repo)
+    service = UserService(
+        user_repo=repos.users, token_repo=repos.refresh_tokens
+    )
 
     return service
 
 
 def get_post_service(
-    session: AsyncSession = Depends(get_session),
+    repos: Repositories = Depends(get_repositories),
+    context: RequestContext = Depends(get_request_context),
 ) -> PostService:
-    repo = PostRepository(session)
-    user_repo = UserRepository(session)
-    service = PostService(post_repo=repo, user_repo=user_repo)
+    service = PostService(
+        post_repo=repos.posts, user_repo=repos.users, context=context
+    )
     return service
 
 
 def get_like_service(
-    session: AsyncSession = Depends(get_session),
+    repos: Repositories = Depends(get_repositories),
+    context: RequestContext = Depends(get_request_context),
 ) -> LikeService:
-    repo = LikeRepository(session)
-    post_repo = PostRepository(session)
-    user_repo = UserRepository(session)
     service = LikeService(
-        like_repo=repo, post_repo=post_repo, user_repo=user_repo
+        like_repo=repos.likes,
+        post_repo=repos.posts,
+        user_repo=repos.users,
+        context=context,
     )
     return service
+
+
+def get_export_service(
+    repos: Repositories = Depends(get_repositories),
+) -> ExportService:
+    return ExportService(like_repo=repos.likes, post_repo=repos.posts)
+
+
+def get_analytics_service(
+    repos: Repositories = Depends(get_repositories),
+) -> AnalyticsService:
+    return AnalyticsService(
+        like_repo=repos.likes,
+        user_repo=repos.users,
+        stats_repo=repos.daily_like_stats,
+    )
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+BatchExecutor = Callable[[list[Any]], Awaitable[list[Any]]]
+
+
+class GroupCommit:
+    """
+    Runs writes submitted concurrently as batches, one transaction each.
+
+    A submission waits until ``max_batch`` items are pending or ``max_delay``
+    seconds have passed since the first one, then the whole batch is handed
+    to ``execute_batch``. It must return one result per item, in order; each
+    caller receives its own result, or the exception if the batch failed.
+
+    Attributes:
+        max_batch (int): The largest number of items written at once.
+        max_delay (float): Seconds the first item of a batch may wait.
+    """
+
+    def __init__(
+        self, execute_batch: BatchExecutor, max_batch: int, max_delay: float
+    ):
+        self.execute_batch = execute_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self._flush
+            )
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._execute(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(self, batch: list[tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self.execute_batch([item for item, _ in batch])
+        except Exception as exc:
+            logger.exception("Group commit of %s items failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            # Callers that gave up no longer wait for their result.
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "average_batch": round(self.items / self.batches, 2)
+            if self.batches
+            else 0.0,
+            "pending": len(self._pending),
+        }
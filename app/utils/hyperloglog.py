@@ -0,0 +1,166 @@
+"""
+HyperLogLog sketches of distinct integer ids.
+
+A sketch of precision ``p`` keeps ``m = 2 ** p`` one-byte registers and
+estimates the number of distinct ids added to it with a relative standard
+error of about ``1.04 / sqrt(m)``: 0.81% for the default precision of 14, so
+roughly 95% of estimates are within 1.6% and 99.7% within 2.4% of the exact
+count. The estimator stays unbiased from a handful of ids to billions,
+including the range around ``2.5 * m`` where the classic one switches from
+linear counting and overestimates by up to 2%. Sketches of the same
+precision merge losslessly by taking the register-wise maximum, which makes
+the distinct count of any union of days available from the per-day sketches.
+"""
+import math
+
+import numpy as np
+
+_SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+_SPLITMIX_MUL2 = np.uint64(0x94D049BB133111EB)
+
+
+def _hash(ids: np.ndarray) -> np.ndarray:
+    # splitmix64 finaliser: consecutive ids end up on unrelated registers.
+    with np.errstate(over="ignore"):
+        x = ids.astype(np.uint64) + _SPLITMIX_GAMMA
+        x = (x ^ (x >> np.uint64(30))) * _SPLITMIX_MUL1
+        x = (x ^ (x >> np.uint64(27))) * _SPLITMIX_MUL2
+    return x ^ (x >> np.uint64(31))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    lengths = np.zeros(values.shape, dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >> np.uint64(shift)
+        has_high = high > 0
+        lengths[has_high] += shift
+        values = np.where(has_high, high, values)
+    return lengths + (values > 0)
+
+
+def _sigma(x: float) -> float:
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x in (0.0, 1.0):
+        return 0.0
+    y = 1.0
+    z = 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+def register_updates(
+    ids: np.ndarray, precision: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the register index and rank of every id for a sketch of this precision.
+    """
+    hashes = _hash(ids)
+    width = 64 - precision
+    indices = (hashes >> np.uint64(width)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << width) - 1)
+    ranks = width + 1 - _bit_length(remainder).astype(np.int64)
+    return indices, ranks.astype(np.uint8)
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter.
+
+    Attributes:
+        precision (int): Number of hash bits selecting a register, 4 to 18.
+        registers (np.ndarray): The ``2 ** precision`` uint8 registers.
+    """
+
+    def __init__(
+        self, precision: int = 14, registers: np.ndarray | None = None
+    ):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        if registers is None:
+            registers = np.zeros(1 << precision, dtype=np.uint8)
+        self.registers = registers
+
+    @staticmethod
+    def relative_error(precision: int) -> float:
+        """
+        Relative standard error of the estimates of a sketch of this precision.
+        """
+        return 1.04 / math.sqrt(1 << precision)
+
+    def add_many(self, ids: np.ndarray):
+        if len(ids):
+            indices, ranks = register_updates(ids, self.precision)
+            np.maximum.at(self.registers, indices, ranks)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError(
+                "Only sketches of the same precision can be merged"
+            )
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        # Ertl's improved estimator ("New cardinality estimation algorithms
+        # for HyperLogLog sketches", 2017): it folds the empty and saturated
+        # registers into the harmonic mean, which removes the bias of the
+        # raw estimate around the switch from linear counting (2.5 * m)
+        # without the empirical bias tables of HyperLogLog++.
+        m = len(self.registers)
+        q = 64 - self.precision
+        counts = np.bincount(self.registers, minlength=q + 2)
+        if counts[0] == m:
+            return 0
+        z = m * _tau(1 - counts[q + 1] / m)
+        for rank in range(q, 0, -1):
+            z = 0.5 * (z + counts[rank])
+        z += m * _sigma(counts[0] / m)
+        return int(round(m * m / (2 * math.log(2) * z)))
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        precision = len(data).bit_length() - 1
+        if len(data) != 1 << precision:
+            raise ValueError("A sketch holds a power of two registers")
+        registers = np.frombuffer(data, dtype=np.uint8).copy()
+        return cls(precision, registers)
+
+
+def sketches_by_day(
+    user_ids: np.ndarray, days: np.ndarray, precision: int
+) -> dict[int, HyperLogLog]:
+    """
+    Builds one sketch of the distinct users of every day present in ``days``.
+    """
+    if len(days) == 0:
+        return {}
+    unique_days, day_codes = np.unique(days, return_inverse=True)
+    size = 1 << precision
+    indices, ranks = register_updates(user_ids, precision)
+    registers = np.zeros(len(unique_days) * size, dtype=np.uint8)
+    np.maximum.at(registers, day_codes * size + indices, ranks)
+    registers = registers.reshape(len(unique_days), size)
+    return {
+        int(day): HyperLogLog(precision, registers[code].copy())
+        for code, day in enumerate(unique_days)
+    }
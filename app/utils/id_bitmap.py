@@ -0,0 +1,68 @@
+class IdBitmap:
+    """
+    Compact exact set of positive integer ids, one bit per id.
+
+    Membership answers are only trusted up to ``watermark``, the highest id
+    known to be fully loaded. Ids above it may have been created elsewhere,
+    so they are reported as possibly existing.
+
+    Attributes:
+        watermark (int): Ids up to this value are known exactly.
+    """
+
+    def __init__(self):
+        self._bits = bytearray()
+        self.count = 0
+        self.watermark = 0
+        self.rejected = 0
+        self.passed_through = 0
+
+    def add(self, obj_id: int):
+        index, mask = obj_id >> 3, 1 << (obj_id & 7)
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index - len(self._bits) + 1 + index // 4))
+        if not self._bits[index] & mask:
+            self._bits[index] |= mask
+            self.count += 1
+
+    def add_many(self, obj_ids):
+        for obj_id in obj_ids:
+            self.add(obj_id)
+
+    def discard(self, obj_id: int):
+        index, mask = obj_id >> 3, 1 << (obj_id & 7)
+        if index < len(self._bits) and self._bits[index] & mask:
+            self._bits[index] &= ~mask
+            self.count -= 1
+
+    def __contains__(self, obj_id: int) -> bool:
+        index = obj_id >> 3
+        return index < len(self._bits) and bool(
+            self._bits[index] & (1 << (obj_id & 7))
+        )
+
+    def might_exist(self, obj_id: int) -> bool:
+        """
+        Returns False only when the id is certainly absent.
+        """
+        if obj_id <= 0:
+            self.rejected += 1
+            return False
+        if obj_id in self:
+            return True
+        if obj_id > self.watermark:
+            self.passed_through += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "watermark": self.watermark,
+            "memory_bytes": len(self._bits),
+            # The bitmap is exact, a present bit always means a present id.
+            "false_positive_rate": 0.0,
+            "rejected": self.rejected,
+            "passed_through": self.passed_through,
+        }
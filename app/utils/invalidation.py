@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+import asyncpg
+
+from config import (
+    DB_HOST,
+    DB_NAME,
+    DB_PASS,
+    DB_PORT,
+    DB_USER,
+    INVALIDATION_BATCH_DELAY,
+    INVALIDATION_CHANNEL,
+)
+
+logger = logging.getLogger(__name__)
+
+InvalidationHandler = Callable[[str, list], Awaitable[None]]
+
+# NOTIFY payloads must stay below 8000 bytes.
+MAX_IDS_PER_MESSAGE = 500
+RECONNECT_DELAY = 5
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations to the other workers over LISTEN/NOTIFY.
+
+    Writers publish (namespace, id) pairs after committing. Pairs published
+    within ``batch_delay`` seconds are sent as one notification such as
+    ``{"w": worker, "t": first_publish_time, "k": {"posts": [1, 2]}}``.
+    Every worker listens on the channel, ignores its own messages and hands
+    the ids to the handlers subscribed to their namespace. Invalidations
+    published while a listener is disconnected are lost, so local caches
+    must still expire their entries.
+
+    Attributes:
+        channel (str): The Postgres notification channel.
+        batch_delay (float): Seconds during which invalidations are batched.
+        worker_id (str): Identifies the messages of this process.
+    """
+
+    def __init__(self, channel: str, batch_delay: float):
+        self.channel = channel
+        self.batch_delay = batch_delay
+        self.worker_id = uuid.uuid4().hex[:12]
+        self._handlers: list[tuple[set[str] | None, InvalidationHandler]] = []
+        self._connection: asyncpg.Connection | None = None
+        self._pending: dict[str, set] = {}
+        self._pending_since = 0.0
+        self._flush_task: asyncio.Task | None = None
+        self._dispatching: set[asyncio.Task] = set()
+        self._send_lock = asyncio.Lock()
+        self.published_messages = 0
+        self.published_keys = 0
+        self.send_errors = 0
+        self.received_messages = 0
+        self.received_keys = 0
+        self.malformed_messages = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self._lag_total = 0.0
+
+    def subscribe(
+        self, handler: InvalidationHandler, namespaces: set[str] | None = None
+    ):
+        """
+        Calls ``handler(namespace, ids)`` for remote invalidations, of the
+        given namespaces only unless ``namespaces`` is None.
+        """
+        self._handlers.append((namespaces, handler))
+
+    def publish(self, namespace: str, obj_id: Any):
+        if self._connection is None or self._connection.is_closed():
+            return
+        if not self._pending:
+            self._pending_since = time.time()
+        self._pending.setdefault(namespace, set()).add(obj_id)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.batch_delay)
+        finally:
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self):
+        pending, self._pending = self._pending, {}
+        pairs = [
+            (namespace, obj_id)
+            for namespace, obj_ids in pending.items()
+            for obj_id in obj_ids
+        ]
+        for offset in range(0, len(pairs), MAX_IDS_PER_MESSAGE):
+            keys: dict[str, list] = {}
+            for namespace, obj_id in pairs[
+                offset : offset + MAX_IDS_PER_MESSAGE
+            ]:
+                keys.setdefault(namespace, []).append(obj_id)
+            payload = json.dumps(
+                {"w": self.worker_id, "t": self._pending_since, "k": keys},
+                separators=(",", ":"),
+            )
+            try:
+                async with self._send_lock:
+                    await self._connection.execute(
+                        "SELECT pg_notify($1, $2)", self.channel, payload
+                    )
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                self.send_errors += 1
+                logger.exception("Publishing cache invalidations failed")
+                return
+            self.published_messages += 1
+            self.published_keys += sum(map(len, keys.values()))
+
+    def _on_notification(self, connection, pid, channel, payload: str):
+        # Anything may NOTIFY on the channel, not only other workers.
+        try:
+            message = json.loads(payload)
+            worker_id, keys = message["w"], message["k"]
+            message["t"] = float(message["t"])
+            valid = isinstance(keys, dict) and all(
+                isinstance(obj_ids, list) for obj_ids in keys.values()
+            )
+        except (ValueError, TypeError, KeyError):
+            valid = False
+        if not valid:
+            self.malformed_messages += 1
+            logger.warning("Ignoring malformed invalidation %.200r", payload)
+            return
+        if worker_id == self.worker_id:
+            return
+        task = asyncio.create_task(self._dispatch(message))
+        self._dispatching.add(task)
+        task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, message: dict):
+        for namespace, obj_ids in message["k"].items():
+            for namespaces, handler in self._handlers:
+                if namespaces is not None and namespace not in namespaces:
+                    continue
+                try:
+                    await handler(namespace, obj_ids)
+                except Exception:
+                    logger.exception("Invalidation handler failed")
+            self.received_keys += len(obj_ids)
+
+        # From the first publish on the sending worker to local eviction.
+        lag = max(time.time() - message["t"], 0.0)
+        self.received_messages += 1
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        self._lag_total += lag
+
+    async def run(self):
+        """
+        Keeps a listening connection open, reconnecting when it drops.
+        """
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._connection = await asyncpg.connect(
+                    user=DB_USER,
+                    password=DB_PASS,
+                    host=DB_HOST,
+                    port=int(DB_PORT) if DB_PORT else None,
+                    database=DB_NAME,
+                )
+                self._connection.add_termination_listener(
+                    lambda connection: closed.set()
+                )
+                await self._connection.add_listener(
+                    self.channel, self._on_notification
+                )
+                await closed.wait()
+                logger.warning(
+                    "Invalidation listener disconnected, "
+                    "invalidations may have been missed"
+                )
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.exception("Invalidation listener failed to connect")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self.flush()
+            await self._connection.close()
+        self._connection = None
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "connected": self._connection is not None
+            and not self._connection.is_closed(),
+            "published_messages": self.published_messages,
+            "published_keys": self.published_keys,
+            "send_errors": self.send_errors,
+            "received_messages": self.received_messages,
+            "received_keys": self.received_keys,
+            "malformed_messages": self.malformed_messages,
+            "lag_last_ms": round(self.lag_last * 1000, 2),
+            "lag_avg_ms": round(
+                self._lag_total / self.received_messages * 1000, 2
+            )
+            if self.received_messages
+            else 0.0,
+            "lag_max_ms": round(self.lag_max * 1000, 2),
+        }
+
+
+invalidation_bus = InvalidationBus(
+    INVALIDATION_CHANNEL, INVALIDATION_BATCH_DELAY
+)
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from config import JOB_QUEUE_BATCH_SIZE, JOB_QUEUE_SIZE, JOB_QUEUE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[list[Any]], Awaitable[None]]
+
+
+class JobQueue:
+    """
+    In-process asyncio queue for side effects the client does not wait on.
+
+    Jobs are (kind, payload) pairs. Workers take up to ``batch_size`` queued
+    jobs at once and call the handler registered for each kind a single time
+    with all payloads of that kind, so bookkeeping writes can be batched.
+
+    Attributes:
+        maxsize (int): The number of jobs that may wait in the queue.
+        workers (int): The number of worker tasks.
+        batch_size (int): The largest number of jobs taken by a worker at once.
+    """
+
+    def __init__(self, maxsize: int, workers: int, batch_size: int):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    def enqueue(self, kind: str, payload: Any) -> bool:
+        """
+        Adds a job without waiting. Returns False if the job was dropped.
+        """
+        if not self.running:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((kind, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.warning("Job queue is full, dropping %s job", kind)
+            return False
+        self.enqueued += 1
+        return True
+
+    async def start(self):
+        self._queue = asyncio.Queue(self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0):
+        """
+        Stops accepting jobs, waits for queued ones to finish and stops the workers.
+        """
+        if not self.running:
+            return
+        tasks, self._tasks = self._tasks, []
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Job queue drain timed out with %s jobs left",
+                self._queue.qsize(),
+            )
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+    async def _worker(self):
+        while True:
+            jobs = [await self._queue.get()]
+            while len(jobs) < self.batch_size:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._run(jobs)
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    async def _run(self, jobs: list[tuple[str, Any]]):
+        payloads_by_kind: dict[str, list[Any]] = {}
+        for kind, payload in jobs:
+            payloads_by_kind.setdefault(kind, []).append(payload)
+
+        for kind, payloads in payloads_by_kind.items():
+            self.batches += 1
+            try:
+                await self._handlers[kind](payloads)
+            except Exception:
+                self.failed += len(payloads)
+                logger.exception("Background %s job failed", kind)
+            else:
+                self.processed += len(payloads)
+
+
+job_queue = JobQueue(
+    maxsize=JOB_QUEUE_SIZE,
+    workers=JOB_QUEUE_WORKERS,
+    batch_size=JOB_QUEUE_BATCH_SIZE,
+)
@@ -0,0 +1,88 @@
+import asyncio
+
+from fastapi.responses import JSONResponse
+
+
+class Lifecycle:
+    """
+    Readiness and in-flight request tracking of one worker.
+
+    Attributes:
+        ready (bool): True once warm-up finished and until draining starts.
+        draining (bool): True once shutdown started; new requests are refused.
+        in_flight (int): The number of requests currently being handled.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def request_started(self):
+        self.in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self):
+        self.in_flight -= 1
+        if not self.in_flight:
+            self._idle.set()
+
+    def start_draining(self):
+        self.ready = False
+        self.draining = True
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Refuses new requests and waits for the in-flight ones to finish.
+
+        Returns:
+            bool: False if requests were still running when the timeout expired.
+        """
+        self.start_draining()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "draining": self.draining,
+            "in_flight": self.in_flight,
+        }
+
+
+class LifecycleMiddleware:
+    """
+    ASGI middleware counting in-flight requests and refusing new ones while draining.
+    """
+
+    def __init__(self, app, lifecycle: Lifecycle):
+        self.app = app
+        self.lifecycle = lifecycle
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.lifecycle.draining:
+            response = JSONResponse(
+                {"detail": "Server is shutting down"},
+                status_code=503,
+                headers={"Connection": "close", "Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.request_finished()
+
+
+lifecycle = Lifecycle()
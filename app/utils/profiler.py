@@ -0,0 +1,280 @@
+import asyncio
+import functools
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime
+
+from config import PROFILER_INTERVAL, PROFILER_KEEP_REQUESTS
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Longest first, so files are named relative to the innermost sys.path entry.
+_PATH_PREFIXES = sorted(
+    {os.path.abspath(path) + os.sep for path in sys.path},
+    key=len,
+    reverse=True,
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _frame_name(filename: str, qualname: str) -> str:
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    # ";" separates frames in the collapsed format.
+    return f"{filename}:{qualname}".replace(";", ":")
+
+
+def collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(_frame_name(code.co_filename, code.co_qualname))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def format_collapsed(samples: Counter) -> str:
+    """
+    Renders samples as collapsed stacks, one ``frame;frame;frame count``
+    line per distinct stack, as read by flamegraph.pl, inferno and speedscope.
+    """
+    return "".join(
+        f"{stack} {count}\n" for stack, count in samples.most_common()
+    )
+
+
+class StackSampler:
+    """
+    Samples the stack of one thread from a background thread.
+
+    Every ``interval`` seconds the current frame of the target thread is read
+    through ``sys._current_frames()`` and counted as a collapsed stack. The
+    target thread is not instrumented, so it only pays for the GIL the
+    sampler takes while it walks the stack; while it runs Python code the
+    sampler waits up to ``sys.getswitchinterval()`` for the GIL, which bounds
+    the effective sampling rate. When ``task`` is given, samples taken while
+    another task of ``loop`` runs, or the loop is idle, are skipped.
+
+    Attributes:
+        samples (Counter): Sample counts by collapsed stack.
+        skipped (int): Samples dropped because ``task`` was not running.
+    """
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float,
+        loop: asyncio.AbstractEventLoop | None = None,
+        task: asyncio.Task | None = None,
+    ):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.loop = loop
+        self.task = task
+        self.samples: Counter = Counter()
+        self.skipped = 0
+        self.duration = 0.0
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+        return self.samples
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if (
+                self.task is not None
+                and asyncio.current_task(self.loop) is not self.task
+            ):
+                self.skipped += 1
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse(frame)] += 1
+
+
+class Profiler:
+    """
+    Runs on-demand stack samplers over the event loop thread.
+
+    Nothing is sampled while no profile is being taken. Only one sampler runs
+    at a time, so a profile requested while another is in progress is
+    refused. The profiles of the last ``keep_requests`` sampled requests are
+    kept for later download.
+
+    Attributes:
+        interval (float): Default seconds between samples.
+        keep_requests (int): How many request profiles are kept.
+    """
+
+    def __init__(self, interval: float, keep_requests: int):
+        self.interval = interval
+        self.keep_requests = keep_requests
+        self.request_profiles: OrderedDict[str, dict] = OrderedDict()
+        self._active: StackSampler | None = None
+        self.profiles_taken = 0
+        self.requests_profiled = 0
+        self.requests_refused = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._active is not None
+
+    def _start(
+        self, interval: float, task: asyncio.Task | None = None
+    ) -> StackSampler | None:
+        if self._active is not None:
+            return None
+        sampler = StackSampler(
+            threading.get_ident(), interval, asyncio.get_running_loop(), task
+        )
+        sampler.start()
+        self._active = sampler
+        return sampler
+
+    def _stop(self, sampler: StackSampler) -> Counter:
+        self._active = None
+        return sampler.stop()
+
+    async def profile(
+        self, seconds: float, interval: float | None = None
+    ) -> Counter | None:
+        """
+        Samples the event loop for ``seconds``, whatever it runs meanwhile.
+
+        Returns:
+            Counter | None: Samples by collapsed stack, or None if another
+            profile is in progress.
+        """
+        sampler = self._start(interval or self.interval)
+        if sampler is None:
+            return None
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            samples = self._stop(sampler)
+        self.profiles_taken += 1
+        return samples
+
+    def start_request(self) -> StackSampler | None:
+        sampler = self._start(self.interval, asyncio.current_task())
+        if sampler is None:
+            self.requests_refused += 1
+        return sampler
+
+    def finish_request(
+        self, profile_id: str, sampler: StackSampler, method: str, path: str
+    ):
+        samples = self._stop(sampler)
+        self.requests_profiled += 1
+        self.request_profiles[profile_id] = {
+            "id": profile_id,
+            "method": method,
+            "path": path,
+            "finished_at": datetime.utcnow().isoformat(),
+            "duration_ms": round(sampler.duration * 1000, 2),
+            "samples": sum(samples.values()),
+            "skipped": sampler.skipped,
+            "stacks": samples,
+        }
+        while len(self.request_profiles) > self.keep_requests:
+            self.request_profiles.popitem(last=False)
+
+    def list_request_profiles(self) -> list[dict]:
+        return [
+            {key: value for key, value in profile.items() if key != "stacks"}
+            for profile in reversed(self.request_profiles.values())
+        ]
+
+    def get_request_profile(self, profile_id: str) -> Counter | None:
+        profile = self.request_profiles.get(profile_id)
+        return None if profile is None else profile["stacks"]
+
+    def stats(self) -> dict:
+        return {
+            "busy": self.busy,
+            "interval_ms": self.interval * 1000,
+            "profiles_taken": self.profiles_taken,
+            "requests_profiled": self.requests_profiled,
+            "requests_refused": self.requests_refused,
+            "request_profiles_kept": len(self.request_profiles),
+        }
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware sampling single requests to one route on demand.
+
+    Requests whose path starts with ``route`` and that carry an ``X-Profile``
+    header equal to ``token`` are sampled while they run, unless another
+    profile is in progress. The response then carries an ``X-Profile-Id``
+    header naming the stored profile. Sampling is disabled while either
+    setting is empty.
+    """
+
+    def __init__(self, app, profiler: Profiler, route: str, token: str):
+        self.app = app
+        self.profiler = profiler
+        self.route = route
+        self.token = token.encode()
+
+    def _wants_profile(self, scope) -> bool:
+        if not self.route or not self.token:
+            return False
+        if not scope["path"].startswith(self.route):
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = self.profiler.start_request()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (PROFILE_ID_HEADER, profile_id.encode()),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.finish_request(
+                profile_id, sampler, scope["method"], scope["path"]
+            )
+
+
+profiler = Profiler(PROFILER_INTERVAL, PROFILER_KEEP_REQUESTS)
@@ -0,0 +1,29 @@
+from fastapi import HTTPException
+
+
+def parse_ids(ids: str, max_count: int) -> list[int]:
+    """
+    Parses a comma-separated list of ids from a query parameter.
+
+    Args:
+        ids (str): The raw query value, for example "1,2,3".
+        max_count (int): The maximum number of distinct ids allowed.
+
+    Returns:
+        list[int]: The distinct ids in the order they were given.
+
+    Raises:
+        HTTPException: If an id is not an integer, or if there are no ids or too many.
+    """
+    try:
+        parsed = [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ids must be integers")
+    parsed = list(dict.fromkeys(parsed))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="No ids given")
+    if len(parsed) > max_count:
+        raise HTTPException(
+            status_code=400, detail=f"At most {max_count} ids are allowed"
+        )
+    return parsed
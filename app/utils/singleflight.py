@@ -0,0 +1,99 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Hashable
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, dict):
+        return tuple(
+            sorted((key, _freeze(item)) for key, item in value.items())
+        )
+    return value
+
+
+class SingleFlight:
+    """
+    Lets concurrent callers with the same key share one in-flight call.
+
+    The first caller runs the call, later callers await its result or
+    exception. If the running caller is cancelled, one of the waiters runs
+    the call again instead of failing. Nothing is kept once the call ends.
+    Counters are kept per namespace.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._counters: dict[str, dict[str, int]] = {}
+
+    async def do(
+        self,
+        namespace: str,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        counters = self._counters.setdefault(
+            namespace, {"calls": 0, "executions": 0, "coalesced": 0}
+        )
+        counters["calls"] += 1
+        flight_key = (namespace, key)
+
+        while (running := self._in_flight.get(flight_key)) is not None:
+            counters["coalesced"] += 1
+            try:
+                return await asyncio.shield(running)
+            except asyncio.CancelledError:
+                if not running.cancelled():
+                    raise
+                counters["coalesced"] -= 1
+
+        running = asyncio.get_running_loop().create_future()
+        self._in_flight[flight_key] = running
+        counters["executions"] += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            running.cancel()
+            raise
+        except Exception as exc:
+            running.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting.
+            running.exception()
+            raise
+        finally:
+            del self._in_flight[flight_key]
+        running.set_result(result)
+        return result
+
+    def coalesce(self, namespace: str):
+        """
+        Decorates a method so that concurrent calls with equal arguments
+        share one execution, whatever instance they are made on.
+        """
+
+        def decorator(method):
+            @functools.wraps(method)
+            async def wrapper(instance, *args, **kwargs):
+                key = (_freeze(args), _freeze(kwargs))
+                return await self.do(
+                    namespace, key, lambda: method(instance, *args, **kwargs)
+                )
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        in_flight: dict[str, int] = {}
+        for namespace, _ in self._in_flight:
+            in_flight[namespace] = in_flight.get(namespace, 0) + 1
+        return {
+            namespace: {**counters, "in_flight": in_flight.get(namespace, 0)}
+            for namespace, counters in self._counters.items()
+        }
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the vectorised activity metrics on synthetic data.
+
+Run from the project root:
+    python -m benchmarks.analytics --likes 10000000 --users 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.utils import activity_metrics
+
+
+def main(args):
+    rng = np.random.default_rng(0)
+    first_day = activity_metrics.day_number(
+        activity_metrics.EPOCH.replace(year=2023)
+    )
+    last_day = first_day + args.days - 1
+
+    signup_user_ids = np.arange(1, args.users + 1, dtype=np.int64)
+    signup_days = rng.integers(first_day, last_day + 1, args.users)
+    like_user_ids = rng.integers(1, args.users + 1, args.likes)
+    like_days = rng.integers(first_day, last_day + 1, args.likes)
+
+    started = time.perf_counter()
+    activity_metrics.active_users(
+        like_user_ids, like_days, first_day, last_day
+    )
+    active_users_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    activity_metrics.retention_cohorts(
+        signup_user_ids,
+        signup_days,
+        like_user_ids,
+        like_days,
+        first_day,
+        last_day,
+    )
+    retention_seconds = time.perf_counter() - started
+
+    print(f"{args.likes} likes, {args.users} users, {args.days} days")
+    print(f"active users: {active_users_seconds:.2f}s")
+    print(f"retention cohorts: {retention_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--likes", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=180)
+    main(parser.parse_args())
@@ -0,0 +1,117 @@
+"""
+Service-layer throughput on the in-memory repositories, without a database.
+
+Seeds --users users and --posts posts into a memory store, then times likes
+added and removed through LikeService, batched like counts through
+PostService and the analytics of LikeService and AnalyticsService over all
+the likes, so that changes to service logic can be measured apart from
+database latency.
+
+Run from the project root:
+    python -m benchmarks.services --likes 100000
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.repositories.memory.store import MemoryStore
+from app.services.analytics_service import AnalyticsService
+from app.services.like_service import LikeService
+from app.services.post_filter import post_id_filter
+from app.services.post_service import PostService, like_counts_cache
+from app.utils.dependencies.repositories import memory_repositories
+
+
+async def seed(repos, users: int, posts: int):
+    await repos.users.bulk_create(
+        [
+            {
+                "username": f"user{number}",
+                "full_name": f"User {number}",
+                "email": f"user{number}@example.com",
+                "hashed_password": "x",
+            }
+            for number in range(users)
+        ]
+    )
+    now = datetime.utcnow()
+    for number in range(posts):
+        post = repos.posts.model(
+            title=f"Post {number}",
+            content=f"Content {number}",
+            user_id=1 + number % users,
+            created_at=now,
+        )
+        await repos.posts.save(post)
+        post_id_filter.add(post.id)
+
+
+async def timed(name: str, operations: int, call):
+    started = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:<24}{operations:>10,} in {elapsed:>7.3f}s "
+        f"{operations / elapsed:>12,.0f}/s"
+    )
+
+
+async def main(args):
+    repos = memory_repositories(MemoryStore())
+    await seed(repos, args.users, args.posts)
+    like_service = LikeService(
+        like_repo=repos.likes, user_repo=repos.users, post_repo=repos.posts
+    )
+    post_service = PostService(post_repo=repos.posts, user_repo=repos.users)
+    analytics_service = AnalyticsService(
+        like_repo=repos.likes,
+        user_repo=repos.users,
+        stats_repo=repos.daily_like_stats,
+    )
+
+    pairs = random.Random(0).sample(range(args.users * args.posts), args.likes)
+    pairs = [(1 + pair % args.users, 1 + pair // args.users) for pair in pairs]
+
+    async def add_likes():
+        for user_id, post_id in pairs:
+            await like_service.add_like(user_id, post_id)
+
+    async def count_likes():
+        post_ids = list(range(1, args.posts + 1))
+        for offset in range(0, len(post_ids), args.batch):
+            like_counts_cache.clear()
+            await post_service.get_like_counts(
+                post_ids[offset : offset + args.batch]
+            )
+
+    today = datetime.utcnow().date()
+    tomorrow = (today + timedelta(days=1)).isoformat()
+
+    async def like_analytics():
+        await like_service.get_likes_analytics(today.isoformat(), tomorrow)
+
+    async def unique_users():
+        await analytics_service.get_unique_users(
+            today.isoformat(), tomorrow, exact=True
+        )
+
+    async def remove_likes():
+        for user_id, post_id in pairs:
+            await like_service.remove_like(user_id, post_id)
+
+    await timed("add_like", args.likes, add_likes)
+    await timed("get_like_counts", args.posts, count_likes)
+    await timed("get_likes_analytics", args.likes, like_analytics)
+    await timed("get_unique_users", args.likes, unique_users)
+    await timed("remove_like", args.likes, remove_likes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--likes", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -16,6 +16,16 @@ SQLALCHEMY_DATABASE_URL = (
     f"postgresql+asyncpg://{DB_USER}:{DB_PASS}"
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+# Comma-separated database URLs; when set, likes are sharded across them.
+LIKE_SHARD_URLS = [
+    url.strip()
+    for url in os.environ.get("LIKE_SHARD_URLS", "").split(",")
+    if url.strip()
+]
+# Seconds given to in-flight requests to finish on shutdown.
+SHUTDOWN_DRAIN_TIMEOUT = float(os.environ.get("SHUTDOWN_DRAIN_TIMEOUT", 20))
 
 
 JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
@@ -24,9 +34,125 @@ JWT_ALGORITHM = os.environ.get("JWT_ALGORITHM")
 SECRET_KEY = JWT_SECRET_KEY
 ALGORITHM = JWT_ALGORITHM
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 30
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Per-route admission limits, matched by the longest path prefix.
+ADMISSION_LIMITS = {
+    "/users/login/": {"max_concurrency": 4, "max_queue": 32, "timeout": 2.0},
+    "/users/create_user/": {
+        "max_concurrency": 4,
+        "max_queue": 32,
+        "timeout": 2.0,
+    },
+    "/likes/analytics/": {
+        "max_concurrency": 2,
+        "max_queue": 8,
+        "timeout": 5.0,
+    },
+    "/exports/": {"max_concurrency": 2, "max_queue": 4, "timeout": 1.0},
+    # Long-lived event streams must not take the slots of regular requests.
+    "/likes/stream": {
+        "max_concurrency": 10_000,
+        "max_queue": 0,
+        "timeout": 1.0,
+    },
+    "/likes/": {"max_concurrency": 64, "max_queue": 256, "timeout": 1.0},
+    "/posts/": {"max_concurrency": 64, "max_queue": 256, "timeout": 1.0},
+    "/users/": {"max_concurrency": 32, "max_queue": 128, "timeout": 1.0},
+}
+
+
+JOB_QUEUE_SIZE = int(os.environ.get("JOB_QUEUE_SIZE", 10_000))
+JOB_QUEUE_WORKERS = int(os.environ.get("JOB_QUEUE_WORKERS", 2))
+JOB_QUEUE_BATCH_SIZE = int(os.environ.get("JOB_QUEUE_BATCH_SIZE", 100))
+
+
+# Read-through cache of post and user lookups: "memory" or "redis".
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL = float(os.environ.get("CACHE_TTL", 60))
+CACHE_NEGATIVE_TTL = float(os.environ.get("CACHE_NEGATIVE_TTL", 5))
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 100_000))
+
+
+POST_FILTER_REFRESH_SECONDS = float(
+    os.environ.get("POST_FILTER_REFRESH_SECONDS", 30)
+)
+
+
+RECOMMENDATIONS_REBUILD_SECONDS = float(
+    os.environ.get("RECOMMENDATIONS_REBUILD_SECONDS", 600)
+)
+
+
+LIKE_STREAM_INTERVAL = float(os.environ.get("LIKE_STREAM_INTERVAL", 1))
+LIKE_STREAM_MAX_POSTS = int(os.environ.get("LIKE_STREAM_MAX_POSTS", 100))
+
+
+# Unique user counts over ranges up to this many days are exact; longer
+# ranges merge per-day HyperLogLog sketches instead.
+ANALYTICS_EXACT_MAX_DAYS = int(os.environ.get("ANALYTICS_EXACT_MAX_DAYS", 31))
+# 2 ** precision bytes per day, relative standard error 1.04 / sqrt(2 ** precision).
+HLL_PRECISION = int(os.environ.get("HLL_PRECISION", 14))
+
+
+# Directory of the columnar like archive; empty disables archival.
+LIKE_ARCHIVE_DIR = os.environ.get("LIKE_ARCHIVE_DIR", "")
+# Calendar months that ended this many days ago are moved to the archive.
+LIKE_ARCHIVE_AFTER_DAYS = int(os.environ.get("LIKE_ARCHIVE_AFTER_DAYS", 90))
+LIKE_ARCHIVE_INTERVAL_SECONDS = float(
+    os.environ.get("LIKE_ARCHIVE_INTERVAL_SECONDS", 24 * 60 * 60)
+)
+# Seconds between rescans of the archive directory for months published by
+# other workers, in case their notification was lost.
+LIKE_ARCHIVE_REFRESH_SECONDS = float(
+    os.environ.get("LIKE_ARCHIVE_REFRESH_SECONDS", 60)
+)
+
+
+# Postgres channel carrying cache invalidations between workers, and the
+# seconds during which invalidations are batched into one notification.
+INVALIDATION_CHANNEL = os.environ.get(
+    "INVALIDATION_CHANNEL", "cache_invalidation"
+)
+INVALIDATION_BATCH_DELAY = float(
+    os.environ.get("INVALIDATION_BATCH_DELAY", 0.01)
+)
+
+
+# Group commit of like inserts: concurrent likes are written together once
+# MAX_BATCH are pending or MAX_DELAY seconds after the first one.
+LIKE_GROUP_COMMIT = os.environ.get("LIKE_GROUP_COMMIT", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+LIKE_GROUP_COMMIT_MAX_BATCH = int(
+    os.environ.get("LIKE_GROUP_COMMIT_MAX_BATCH", 256)
+)
+LIKE_GROUP_COMMIT_MAX_DELAY = float(
+    os.environ.get("LIKE_GROUP_COMMIT_MAX_DELAY", 0.002)
+)
+
+
+# On-demand stack sampling of the event loop: seconds between samples, the
+# longest profile an admin may request and how many request profiles are kept.
+PROFILER_INTERVAL = float(os.environ.get("PROFILER_INTERVAL", 0.005))
+PROFILER_MAX_SECONDS = float(os.environ.get("PROFILER_MAX_SECONDS", 60))
+PROFILER_KEEP_REQUESTS = int(os.environ.get("PROFILER_KEEP_REQUESTS", 20))
+# Requests under this path prefix with an "X-Profile: <PROFILER_TOKEN>" header
+# are sampled individually; empty values disable per-request sampling.
+PROFILER_ROUTE = os.environ.get("PROFILER_ROUTE", "")
+PROFILER_TOKEN = os.environ.get("PROFILER_TOKEN", "")
+
+
+# Storage behind the repositories: "sqlalchemy" for Postgres, or "memory"
+# for in-process tables that are lost on restart, for tests and benchmarks.
+REPOSITORY_BACKEND = os.environ.get("REPOSITORY_BACKEND", "sqlalchemy")
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import csv
+import logging
+
+from app.serializers.user_serializer import UserCreate
+from app.services.user_import import UserImporter
+
+logging.basicConfig(level=logging.INFO)
+
+
+def read_users(path: str):
+    """
+    Reads users from a CSV file with username, full_name, email and password columns.
+
+    Args:
+        path (str): The path to the CSV file.
+
+    Yields:
+        UserCreate: The users found in the file.
+    """
+    with open(path, newline="") as csv_file:
+        for row in csv.DictReader(csv_file):
+            yield UserCreate(
+                username=row["username"],
+                full_name=row["full_name"],
+                email=row["email"],
+                password=row["password"],
+            )
+
+
+async def main(args):
+    importer = UserImporter(
+        batch_size=args.batch_size, processes=args.processes
+    )
+    result = await importer.import_users(read_users(args.path))
+    logging.info(
+        f"Imported {result['imported']} users, "
+        f"skipped {result['skipped']} existing ones"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users from CSV")
+    parser.add_argument("path", help="CSV file with the users to import")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
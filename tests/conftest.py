@@ -0,0 +1,21 @@
+import os
+
+from sqlalchemy.engine import make_url
+
+# Settings read when config is imported. Tests needing Postgres run against
+# TEST_DATABASE_URL, which they wipe, and are skipped when it is not set.
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    url = make_url(TEST_DATABASE_URL)
+    os.environ["DB_USER"] = url.username or ""
+    os.environ["DB_PASS"] = url.password or ""
+    os.environ["DB_HOST"] = url.host or "localhost"
+    os.environ["DB_PORT"] = str(url.port or 5432)
+    os.environ["DB_NAME"] = url.database
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASS", "test")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
+os.environ.setdefault("JWT_ALGORITHM", "HS256")
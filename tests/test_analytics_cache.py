@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import Like
+from app.repositories.memory.store import MemoryStore
+from app.services.analytics_service import (
+    AnalyticsService,
+    closed_period_cache,
+)
+from app.services.like_service import LikeService
+from app.services.post_filter import post_id_filter
+from app.utils.dependencies.repositories import memory_repositories
+
+
+def test_removing_a_past_like_refreshes_cached_closed_ranges():
+    async def scenario():
+        closed_period_cache.clear()
+        repos = memory_repositories(MemoryStore())
+        await repos.users.bulk_create(
+            [
+                {
+                    "username": f"user{number}",
+                    "full_name": f"User {number}",
+                    "email": f"user{number}@example.com",
+                    "hashed_password": "x",
+                }
+                for number in range(2)
+            ]
+        )
+        post = repos.posts.model(
+            title="Post", content="Content", user_id=1, created_at=None
+        )
+        await repos.posts.save(post)
+        post_id_filter.add(post.id)
+        last_week = datetime.utcnow() - timedelta(days=7)
+        for user_id in (1, 2):
+            repos.likes.store.insert(
+                Like(
+                    user_id=user_id,
+                    post_id=post.id,
+                    is_liked=True,
+                    created_at=last_week,
+                )
+            )
+
+        analytics = AnalyticsService(
+            like_repo=repos.likes,
+            user_repo=repos.users,
+            stats_repo=repos.daily_like_stats,
+        )
+        likes = LikeService(
+            like_repo=repos.likes, user_repo=repos.users, post_repo=repos.posts
+        )
+        day = last_week.date().isoformat()
+
+        before = await analytics.get_unique_users(day, day)
+        await likes.remove_like(2, post.id)
+        after = await analytics.get_unique_users(day, day)
+        return before, after
+
+    before, after = asyncio.run(scenario())
+    assert (before["likes_count"], before["users_count"]) == (2, 2)
+    assert (after["likes_count"], after["users_count"]) == (1, 1)
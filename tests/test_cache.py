@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.utils.cache import CacheBackend, LRUCacheBackend, ReadThroughCache
+
+
+def test_backends_must_implement_the_interface():
+    class Incomplete(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_load_overtaken_by_an_invalidation_is_not_stored():
+    async def scenario():
+        cache = ReadThroughCache(LRUCacheBackend(100), ttl=60, negative_ttl=5)
+        loading = asyncio.Event()
+        resume = asyncio.Event()
+        rows = {"title": "old"}
+
+        async def load():
+            row = dict(rows)
+            loading.set()
+            await resume.wait()
+            return row
+
+        first = asyncio.create_task(cache.get_or_load("posts", 1, load))
+        await loading.wait()
+        rows["title"] = "new"
+        await cache.invalidate("posts", 1)
+        resume.set()
+
+        assert await first == {"title": "old"}
+        loading.clear()
+        return await cache.get_or_load("posts", 1, load), cache
+
+    value, cache = asyncio.run(scenario())
+    assert value == {"title": "new"}
+    assert cache.stale_loads == 1
+    assert cache.misses == 2
+
+
+def test_loaded_value_is_served_from_the_cache():
+    async def scenario():
+        cache = ReadThroughCache(LRUCacheBackend(100), ttl=60, negative_ttl=5)
+        loads = []
+
+        async def load():
+            loads.append(1)
+            return {"title": "post"}
+
+        for _ in range(3):
+            await cache.get_or_load("posts", 1, load)
+        return len(loads), cache.hits
+
+    assert asyncio.run(scenario()) == (1, 2)
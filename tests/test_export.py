@@ -0,0 +1,28 @@
+import asyncio
+
+from app.repositories.memory.store import MemoryStore
+from app.services.export_service import ExportService
+from app.utils.dependencies.repositories import memory_repositories
+
+
+def export(entity: str, export_format: str) -> str:
+    async def collect():
+        repos = memory_repositories(MemoryStore())
+        service = ExportService(repos.likes, repos.posts)
+        chunks = service.export(
+            entity, "2024-01-01", "2024-01-31", export_format
+        )
+        return "".join([chunk async for chunk in chunks])
+
+    return asyncio.run(collect())
+
+
+def test_empty_csv_export_has_a_header():
+    assert export("likes", "csv") == (
+        "id,user_id,post_id,is_liked,created_at\r\n"
+    )
+    assert export("posts", "csv") == "id,user_id,title,content,created_at\r\n"
+
+
+def test_empty_ndjson_export_is_empty():
+    assert export("likes", "ndjson") == ""
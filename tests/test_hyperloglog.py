@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.utils.hyperloglog import HyperLogLog
+
+PRECISION = 14
+TRIALS = 20
+ERROR = HyperLogLog.relative_error(PRECISION)
+
+
+def estimate(ids: np.ndarray) -> float:
+    sketch = HyperLogLog(PRECISION)
+    sketch.add_many(ids)
+    return sketch.count() / len(ids) - 1
+
+
+@pytest.mark.parametrize(
+    "count", [1_000, 10_000, 20_000, 40_000, 60_000, 100_000, 1_000_000]
+)
+def test_random_ids_are_counted_without_bias(count):
+    rng = np.random.default_rng(count)
+    errors = np.array(
+        [
+            estimate(rng.integers(0, 1 << 62, count))
+            for _ in range(TRIALS if count <= 100_000 else 4)
+        ]
+    )
+    # The mean of the trials has a standard error of ERROR / sqrt(TRIALS).
+    assert abs(errors.mean()) < 3 * ERROR / np.sqrt(len(errors))
+    assert np.abs(errors).max() < 4 * ERROR
+
+
+@pytest.mark.parametrize("count", [20_000, 40_000, 50_000, 100_000])
+def test_sequential_ids_are_counted_without_bias(count):
+    errors = np.array(
+        [
+            estimate(np.arange(start * count + 1, (start + 1) * count + 1))
+            for start in range(TRIALS)
+        ]
+    )
+    assert abs(errors.mean()) < 3 * ERROR / np.sqrt(TRIALS)
+    assert np.abs(errors).max() < 4 * ERROR
+
+
+def test_merged_sketches_count_the_union():
+    ids = np.arange(1, 80_001)
+    first, second = HyperLogLog(PRECISION), HyperLogLog(PRECISION)
+    first.add_many(ids[:50_000])
+    second.add_many(ids[30_000:])
+    first.merge(second)
+    assert abs(first.count() / len(ids) - 1) < 4 * ERROR
+
+
+def test_empty_sketch_counts_zero():
+    assert HyperLogLog(PRECISION).count() == 0
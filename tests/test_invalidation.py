@@ -0,0 +1,47 @@
+import asyncio
+import json
+import time
+
+from app.utils.invalidation import InvalidationBus
+
+
+def test_notifications_reach_subscribed_handlers():
+    async def scenario():
+        bus = InvalidationBus("invalidations", batch_delay=0.01)
+        received = []
+
+        async def handler(namespace, obj_ids):
+            received.append((namespace, obj_ids))
+
+        bus.subscribe(handler, {"posts"})
+        for worker_id in ("other", bus.worker_id):
+            payload = {
+                "w": worker_id,
+                "t": time.time(),
+                "k": {"posts": [1, 2], "users": [3]},
+            }
+            bus._on_notification(None, 0, bus.channel, json.dumps(payload))
+        await asyncio.gather(*bus._dispatching)
+        return bus, received
+
+    bus, received = asyncio.run(scenario())
+    assert received == [("posts", [1, 2])]
+    assert bus.received_messages == 1
+
+
+def test_malformed_notifications_are_ignored():
+    async def scenario():
+        bus = InvalidationBus("invalidations", batch_delay=0.01)
+        for payload in (
+            "not json",
+            "[1, 2]",
+            '{"w": "other"}',
+            '{"w": "other", "t": "now", "k": {}}',
+            '{"w": "other", "t": 0, "k": {"posts": 1}}',
+        ):
+            bus._on_notification(None, 0, bus.channel, payload)
+        return bus
+
+    bus = asyncio.run(scenario())
+    assert bus.malformed_messages == 5
+    assert not bus._dispatching
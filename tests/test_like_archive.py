@@ -0,0 +1,52 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from app.core.like_archive import LikeArchive, to_microseconds
+
+JANUARY = date(2025, 1, 1)
+
+
+def january_likes(count: int) -> dict[str, np.ndarray]:
+    created_at = to_microseconds(datetime(2025, 1, 15))
+    return {
+        "id": np.arange(1, count + 1),
+        "user_id": np.arange(1, count + 1),
+        "post_id": np.full(count, 7),
+        "is_liked": np.ones(count, dtype=bool),
+        "created_at": np.full(count, created_at),
+    }
+
+
+def test_pending_month_is_read_once_its_live_rows_are_gone(tmp_path):
+    archiver = LikeArchive(str(tmp_path))
+    archiver.open()
+    reader = LikeArchive(str(tmp_path))
+    reader.open()
+
+    archiver.write_month(JANUARY, january_likes(3))
+    reader.refresh()
+    assert list(reader.pending) == [JANUARY]
+
+    # Some shard still holds likes of January.
+    reader.set_live_from(datetime(2025, 1, 20))
+    assert reader.count_likes([7]) == {}
+
+    reader.set_live_from(datetime(2025, 2, 3))
+    assert reader.count_likes([7]) == {7: 3}
+    assert reader.find(3, 7).id == 3
+
+    archiver.publish_month(JANUARY)
+    reader.refresh()
+    assert list(reader.months) == [JANUARY] and not reader.pending
+    assert reader.count_likes([7]) == {7: 3}
+    assert len(reader.likes_in_range(datetime(2025, 1, 1), datetime.max)) == 3
+
+
+def test_unreadable_until_live_from_is_known(tmp_path):
+    archive = LikeArchive(str(tmp_path))
+    archive.open()
+    archive.write_month(JANUARY, january_likes(2))
+    assert archive.count_likes([7]) == {}
+    archive.set_live_from(None)
+    assert archive.count_likes([7]) == {7: 2}
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import re
+from datetime import date
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"),
+    reason="TEST_DATABASE_URL is not set",
+)
+
+READS_USERS = re.compile(r"\bFROM users\b", re.IGNORECASE)
+TODAY = date.today().isoformat()
+
+# Every endpoint behind authentication, with a request that reaches its
+# handler. Each may read the users table once, to resolve the caller.
+AUTHENTICATED_REQUESTS = {
+    ("POST", "/posts/create_post/"): {
+        "json": {"title": "Title", "content": "Content"}
+    },
+    ("GET", "/users/users/me/"): {},
+    ("POST", "/likes/like_post/{post_id}"): {},
+    ("POST", "/likes/delete_like_for_post/{post_id}"): {},
+    ("GET", "/exports/{entity}"): {
+        "params": {"date_from": TODAY, "date_to": TODAY, "format": "csv"}
+    },
+    ("GET", "/profiling/cpu/"): {"params": {"seconds": 0.01}},
+    ("GET", "/profiling/requests/"): {},
+    ("GET", "/profiling/requests/{profile_id}"): {},
+}
+
+
+def authenticated_routes(app):
+    from app.auth.security import get_current_profile
+
+    def authenticates(dependant):
+        return dependant.call is get_current_profile or any(
+            authenticates(dependency) for dependency in dependant.dependencies
+        )
+
+    return {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and authenticates(route.dependant)
+        for method in route.methods
+    }
+
+
+@pytest.fixture(scope="module")
+def client():
+    from app.core.database import Base, engine
+    from app.main import app
+
+    async def reset_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(reset_schema())
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="module")
+def statements(client):
+    from app.core.database import engine
+    from app.utils.cache import entity_cache
+
+    # Cached lookups would hide repeated reads after the first request.
+    ttls = entity_cache.ttl, entity_cache.negative_ttl
+    entity_cache.ttl = entity_cache.negative_ttl = 0
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *_):
+        executed.append(statement)
+
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    yield executed
+    entity_cache.ttl, entity_cache.negative_ttl = ttls
+    event.remove(
+        engine.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    from app.core.database import engine
+
+    user = {
+        "username": "alice",
+        "full_name": "Alice",
+        "email": "alice@example.com",
+        "password": "secret123",
+    }
+    assert client.post("/users/create_user/", json=user).status_code == 200
+
+    async def make_admin():
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "UPDATE users SET is_admin = true WHERE username = 'alice'"
+                )
+            )
+
+    client.portal.call(make_admin)
+    token = client.post(
+        "/users/login/",
+        data={"username": user["username"], "password": user["password"]},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_every_authenticated_endpoint_is_checked(client):
+    assert authenticated_routes(client.app) == set(AUTHENTICATED_REQUESTS)
+
+
+def test_authenticated_requests_read_the_user_once(
+    client, headers, statements
+):
+    post_id = None
+    reads = {}
+    for (method, path), options in AUTHENTICATED_REQUESTS.items():
+        url = path.format(post_id=post_id, entity="likes", profile_id="none")
+        statements.clear()
+        response = client.request(method, url, headers=headers, **options)
+        assert response.status_code in (200, 404), (url, response.text)
+        if path == "/posts/create_post/":
+            post_id = response.json()["id"]
+        reads[path] = sum(bool(READS_USERS.search(s)) for s in statements)
+
+    assert reads == dict.fromkeys(reads, 1)
@@ -0,0 +1,96 @@
+import asyncio
+
+from app.auth.security import create_jwt_token, get_current_profile
+from app.repositories.memory.store import MemoryStore
+from app.serializers.post_serializer import PostCreate
+from app.services.like_service import LikeService
+from app.services.post_service import PostService
+from app.utils.dependencies.repositories import memory_repositories
+from app.utils.dependencies.request_context import RequestContext
+
+USER_LOADS = {
+    "get_user_by_id",
+    "get_user_by_username",
+    "get_profile_by_username",
+}
+
+
+class CallLog:
+    """
+    Wraps a repository and records the names of the methods called on it.
+    """
+
+    def __init__(self, repo, calls: list[str]):
+        self._repo = repo
+        self._calls = calls
+
+    def __getattr__(self, name):
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._calls.append(name)
+            return attr(*args, **kwargs)
+
+        return call
+
+
+async def authenticated_request():
+    repos = memory_repositories(MemoryStore())
+    await repos.users.create_unique(
+        {
+            "username": "alice",
+            "full_name": "Alice",
+            "email": "alice@example.com",
+            "hashed_password": "x",
+        }
+    )
+    token = await create_jwt_token({"sub": "alice"})
+    context = RequestContext()
+    profile = await get_current_profile(token, repos, context)
+    return repos, context, profile
+
+
+def test_services_reuse_the_authenticated_user():
+    async def handle():
+        repos, context, profile = await authenticated_request()
+        calls = []
+        users = CallLog(repos.users, calls)
+        posts = CallLog(repos.posts, calls)
+        post_service = PostService(
+            post_repo=posts, user_repo=users, context=context
+        )
+        like_service = LikeService(
+            like_repo=repos.likes,
+            user_repo=users,
+            post_repo=posts,
+            context=context,
+        )
+
+        post = await post_service.create_post(
+            PostCreate(title="Title", content="Content"), profile.id
+        )
+        await like_service.add_like(profile.id, post.id)
+        await like_service.remove_like(profile.id, post.id)
+        return calls
+
+    calls = asyncio.run(handle())
+    assert "save" in calls and "get_post_by_id" in calls
+    assert USER_LOADS.isdisjoint(calls)
+
+
+def test_services_load_the_user_without_a_request_context():
+    async def handle():
+        repos, _, profile = await authenticated_request()
+        calls = []
+        post_service = PostService(
+            post_repo=CallLog(repos.posts, calls),
+            user_repo=CallLog(repos.users, calls),
+        )
+        await post_service.create_post(
+            PostCreate(title="Title", content="Content"), profile.id
+        )
+        return calls
+
+    assert "get_user_by_id" in asyncio.run(handle())